@@ -21,9 +21,26 @@ class Config:
         "product-manual": "product_manual"
     }
     
+    # Collection Layout: "separate" (one collection per domain) or "consolidated"
+    # (all domains in CONSOLIDATED_COLLECTION, filtered on the indexed `domain` payload)
+    COLLECTION_LAYOUT: str = environ.get("COLLECTION_LAYOUT", "separate")
+    CONSOLIDATED_COLLECTION: str = environ.get("CONSOLIDATED_COLLECTION", "documents")
+    
     # Chunking Configuration
     CHUNK_SIZE: int = int(environ.get("CHUNK_SIZE", "300"))
     CHUNK_OVERLAP: int = int(environ.get("CHUNK_OVERLAP", "20"))
+    
+    # Near-Duplicate Detection Configuration (MinHash + LSH over word shingles)
+    DEDUP_ENABLED: bool = environ.get("DEDUP_ENABLED", "true").lower() == "true"
+    DEDUP_THRESHOLD: float = float(environ.get("DEDUP_THRESHOLD", "0.85"))
+    DEDUP_NUM_PERM: int = int(environ.get("DEDUP_NUM_PERM", "128"))
+    DEDUP_BANDS: int = int(environ.get("DEDUP_BANDS", "32"))
+    DEDUP_SHINGLE_SIZE: int = int(environ.get("DEDUP_SHINGLE_SIZE", "3"))
+    
+    # Ingestion Journal Configuration
+    JOURNAL_PATH: str = environ.get("JOURNAL_PATH", "ingestion_journal.db")
+    INGEST_MAX_RETRIES: int = int(environ.get("INGEST_MAX_RETRIES", "3"))
+    INGEST_RETRY_BACKOFF: float = float(environ.get("INGEST_RETRY_BACKOFF", "2"))
 
 def get_settings():
     return Config()
@@ -0,0 +1,106 @@
+import hashlib
+import random
+import re
+from typing import Dict, List, Optional, Set, Tuple
+from core.settings import get_settings
+
+# Mersenne prime used by the universal hash family of the MinHash permutations
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+class MinHasher:
+    """MinHash signatures over word shingles, estimating Jaccard similarity between texts"""
+
+    def __init__(self, num_perm: int, shingle_size: int, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.permutations = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+
+    def shingles(self, text: str) -> Set[str]:
+        """Lower-cased word n-grams; short texts fall back to a single shingle, texts without words have none"""
+        words = re.findall(r"\w+", text.lower())
+        if not words:
+            return set()
+        if len(words) <= self.shingle_size:
+            return {" ".join(words)}
+        return {" ".join(words[i:i + self.shingle_size]) for i in range(len(words) - self.shingle_size + 1)}
+
+    def signature(self, text: str) -> Optional[Tuple[int, ...]]:
+        """MinHash signature of a text, or None if it has no words"""
+        hashes = [
+            int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=4).digest(), 'big')
+            for shingle in self.shingles(text)
+        ]
+        if not hashes:
+            return None
+        return tuple(
+            min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+            for a, b in self.permutations
+        )
+
+def estimated_jaccard(sig_a: Tuple[int, ...], sig_b: Tuple[int, ...]) -> float:
+    """Fraction of matching MinHash values, an unbiased estimate of Jaccard similarity"""
+    return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / len(sig_a)
+
+def validate_lsh_params(num_perm: int, bands: int):
+    """Raise ValueError unless `bands` splits the signature into bands of at least one row"""
+    if num_perm < 1 or bands < 1 or bands > num_perm or num_perm % bands:
+        raise ValueError(
+            f"DEDUP_BANDS ({bands}) must be between 1 and DEDUP_NUM_PERM ({num_perm}) and divide it"
+        )
+
+def find_near_duplicate_clusters(texts: List[str], threshold: float = None, num_perm: int = None,
+                                 bands: int = None, shingle_size: int = None) -> List[List[int]]:
+    """Group texts whose estimated Jaccard similarity is at least `threshold`.
+
+    LSH banding proposes candidate pairs (texts sharing any band of their signature),
+    which are then verified against the threshold and merged with union-find.
+    Texts without any word are never clustered. Returns clusters of text indexes in
+    input order; the first index of each cluster is its representative.
+    """
+    settings = get_settings()
+    threshold = threshold if threshold is not None else settings.DEDUP_THRESHOLD
+    num_perm = num_perm or settings.DEDUP_NUM_PERM
+    bands = bands or settings.DEDUP_BANDS
+    shingle_size = shingle_size or settings.DEDUP_SHINGLE_SIZE
+    validate_lsh_params(num_perm, bands)
+    rows = num_perm // bands
+
+    hasher = MinHasher(num_perm, shingle_size)
+    signatures = [hasher.signature(text) for text in texts]
+
+    parent = list(range(len(texts)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i: int, j: int):
+        root_i, root_j = find(i), find(j)
+        if root_i != root_j:
+            # Keep the earliest text as the root so it becomes the representative
+            parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    for band in range(bands):
+        buckets: Dict[Tuple[int, ...], List[int]] = {}
+        for i, signature in enumerate(signatures):
+            if signature is None:
+                continue
+            buckets.setdefault(signature[band * rows:(band + 1) * rows], []).append(i)
+        for members in buckets.values():
+            for a, i in enumerate(members):
+                for j in members[a + 1:]:
+                    # Pairs already clustered together need no verification
+                    if find(i) != find(j) and estimated_jaccard(signatures[i], signatures[j]) >= threshold:
+                        union(i, j)
+
+    clusters: Dict[int, List[int]] = {}
+    for i in range(len(texts)):
+        clusters.setdefault(find(i), []).append(i)
+    return sorted(clusters.values(), key=lambda cluster: cluster[0])
@@ -0,0 +1,197 @@
+import hashlib
+import sqlite3
+from typing import List, Optional, Tuple
+from core.logger import logger
+from .utils import get_current_timestamp, format_timestamp
+
+def content_hash(text: str) -> str:
+    """Stable hash of a chunk's text, used to detect changed chunks between runs"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+class IngestionJournal:
+    """Local SQLite checkpoint journal of which chunks were durably written to Qdrant"""
+
+    WRITTEN = "written"
+    PENDING = "pending"
+    FAILED = "failed"
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS collections (
+                collection TEXT PRIMARY KEY,
+                completed INTEGER NOT NULL DEFAULT 0,
+                updated_at TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS chunks (
+                collection TEXT NOT NULL,
+                document_id TEXT NOT NULL,
+                chunk_index INTEGER NOT NULL,
+                content_hash TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                representative TEXT,
+                membership TEXT,
+                updated_at TEXT NOT NULL,
+                PRIMARY KEY (collection, document_id, chunk_index)
+            );
+            """
+        )
+        # Journals created before near-duplicate detection lack the representative and membership columns
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(chunks)")}
+        for column in ("representative", "membership"):
+            if column not in columns:
+                self.conn.execute(f"ALTER TABLE chunks ADD COLUMN {column} TEXT")
+        self.conn.commit()
+        logger.info(f"Opened ingestion journal at {db_path}")
+
+    def close(self):
+        """Close the journal database"""
+        self.conn.close()
+
+    def has_collection(self, collection: str) -> bool:
+        """Check whether the journal has ever tracked this collection"""
+        row = self.conn.execute(
+            "SELECT 1 FROM collections WHERE collection = ?", (collection,)
+        ).fetchone()
+        return row is not None
+
+    def is_complete(self, collection: str) -> bool:
+        """Check whether the last run finished the collection without missing chunks"""
+        row = self.conn.execute(
+            "SELECT completed FROM collections WHERE collection = ?", (collection,)
+        ).fetchone()
+        return bool(row and row[0])
+
+    def mark_collection(self, collection: str, completed: bool):
+        """Record whether a collection is fully ingested"""
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO collections (collection, completed, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(collection) DO UPDATE SET completed = excluded.completed, updated_at = excluded.updated_at",
+                (collection, int(completed), _now()),
+            )
+
+    def reset_collection(self, collection: str):
+        """Forget every written chunk of a Qdrant collection (and of its domains in the
+        consolidated layout), e.g. after the collection was dropped or its storage wiped"""
+        keys = (collection, f"{collection}/%")
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM chunks WHERE collection = ? OR collection LIKE ?", keys
+            )
+            self.conn.execute(
+                "UPDATE collections SET completed = 0, updated_at = ? WHERE collection = ? OR collection LIKE ?",
+                (_now(), *keys),
+            )
+
+    def start_document(self, collection: str, doc_id: str, chunk_hashes: List[str]) -> List[int]:
+        """Register a document's chunks; returns indexes of chunks whose stored point is obsolete
+        (text changed or chunk no longer exists)"""
+        now = _now()
+        with self.conn:
+            previous = dict(self.conn.execute(
+                "SELECT chunk_index, content_hash FROM chunks WHERE collection = ? AND document_id = ?",
+                (collection, doc_id),
+            ).fetchall())
+            for chunk_index, chunk_hash in enumerate(chunk_hashes):
+                # New chunks start pending; chunks whose text changed go back to pending
+                self.conn.execute(
+                    "INSERT INTO chunks (collection, document_id, chunk_index, content_hash, status, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(collection, document_id, chunk_index) DO UPDATE SET "
+                    "status = CASE WHEN chunks.content_hash = excluded.content_hash THEN chunks.status ELSE excluded.status END, "
+                    "error = CASE WHEN chunks.content_hash = excluded.content_hash THEN chunks.error ELSE NULL END, "
+                    "content_hash = excluded.content_hash, updated_at = excluded.updated_at",
+                    (collection, doc_id, chunk_index, chunk_hash, self.PENDING, now),
+                )
+            self.conn.execute(
+                "DELETE FROM chunks WHERE collection = ? AND document_id = ? AND chunk_index >= ?",
+                (collection, doc_id, len(chunk_hashes)),
+            )
+        return sorted(
+            chunk_index for chunk_index, chunk_hash in previous.items()
+            if chunk_index >= len(chunk_hashes) or chunk_hashes[chunk_index] != chunk_hash
+        )
+
+    def prune_documents(self, collection: str, doc_ids: List[str]) -> List[Tuple[str, int]]:
+        """Forget documents that are no longer on disk; returns their (document_id, chunk_index)"""
+        placeholders = ",".join("?" * len(doc_ids)) or "''"
+        with self.conn:
+            removed = [
+                (row[0], row[1]) for row in self.conn.execute(
+                    f"SELECT document_id, chunk_index FROM chunks "
+                    f"WHERE collection = ? AND document_id NOT IN ({placeholders})",
+                    (collection, *doc_ids),
+                )
+            ]
+            self.conn.execute(
+                f"DELETE FROM chunks WHERE collection = ? AND document_id NOT IN ({placeholders})",
+                (collection, *doc_ids),
+            )
+        return removed
+
+    def written_representative(self, collection: str, doc_id: str, chunk_index: int):
+        """Key of the point storing a written chunk (see representative_key), or None if not written"""
+        row = self.conn.execute(
+            "SELECT status, COALESCE(representative, document_id || '#' || chunk_index) FROM chunks "
+            "WHERE collection = ? AND document_id = ? AND chunk_index = ?",
+            (collection, doc_id, chunk_index),
+        ).fetchone()
+        return row[1] if row and row[0] == self.WRITTEN else None
+
+    def written_cluster(self, collection: str, doc_id: str, chunk_index: int) -> Optional[Tuple[str, Optional[str]]]:
+        """(representative key, membership hash) the chunk was last written with, or None if not written.
+        The membership hash is None for chunks written before it was journaled"""
+        row = self.conn.execute(
+            "SELECT status, COALESCE(representative, document_id || '#' || chunk_index), membership FROM chunks "
+            "WHERE collection = ? AND document_id = ? AND chunk_index = ?",
+            (collection, doc_id, chunk_index),
+        ).fetchone()
+        return (row[1], row[2]) if row and row[0] == self.WRITTEN else None
+
+    def mark_written(self, collection: str, doc_id: str, chunk_index: int, representative: str = None,
+                     membership: str = None):
+        """Record that a chunk was durably written, possibly as part of a duplicate cluster's point"""
+        self._set_status(collection, doc_id, chunk_index, self.WRITTEN, None,
+                         representative or representative_key(doc_id, chunk_index), membership)
+
+    def mark_failed(self, collection: str, doc_id: str, chunk_index: int, error: str):
+        """Record a failed attempt for a chunk"""
+        self._set_status(collection, doc_id, chunk_index, self.FAILED, error)
+
+    def missing_chunks(self, collection: str) -> List[Tuple[str, int, str]]:
+        """List (document_id, chunk_index, last_error) of chunks not yet written"""
+        return [
+            (row[0], row[1], row[2] or "")
+            for row in self.conn.execute(
+                "SELECT document_id, chunk_index, error FROM chunks "
+                "WHERE collection = ? AND status != ? ORDER BY document_id, chunk_index",
+                (collection, self.WRITTEN),
+            )
+        ]
+
+    def _set_status(self, collection: str, doc_id: str, chunk_index: int, status: str, error,
+                    representative=None, membership=None):
+        with self.conn:
+            self.conn.execute(
+                "UPDATE chunks SET status = ?, error = ?, attempts = attempts + 1, updated_at = ?, "
+                "representative = COALESCE(?, representative), membership = COALESCE(?, membership) "
+                "WHERE collection = ? AND document_id = ? AND chunk_index = ?",
+                (status, error, _now(), representative, membership, collection, doc_id, chunk_index),
+            )
+
+def representative_key(doc_id: str, chunk_index: int) -> str:
+    """Journal key of the point that stores a chunk"""
+    return f"{doc_id}#{chunk_index}"
+
+def membership_hash(keys: List[str]) -> str:
+    """Stable hash of a duplicate cluster's member keys, to detect clusters that gained or lost members"""
+    return hashlib.sha256("\n".join(sorted(keys)).encode('utf-8')).hexdigest()
+
+def _now() -> str:
+    return format_timestamp(get_current_timestamp())
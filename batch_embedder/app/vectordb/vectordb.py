@@ -1,18 +1,32 @@
 import os
+import time
 import uuid
 from pathlib import Path
 from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams, PointStruct, Filter, FieldCondition, MatchValue
+from qdrant_client.models import (
+    Distance, VectorParams, PointStruct, PointIdsList, Filter, FieldCondition, MatchValue, PayloadSchemaType
+)
 from core.settings import get_settings
 from core.logger import logger
 from embeddings.embedding_generator import EmbeddingGenerator
 from .chunkenizer import recursive_character_splitting
+from .dedup import find_near_duplicate_clusters, validate_lsh_params
+from .journal import IngestionJournal, content_hash, membership_hash, representative_key
 from .utils import get_current_timestamp, format_timestamp
 
+def chunk_point_id(doc_id: str, chunk_index: int) -> str:
+    """Deterministic point id, so re-writing a chunk after a restart overwrites it instead of duplicating it"""
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"{doc_id}#{chunk_index}"))
+
 class VectorDB:
     def __init__(self):
         self.settings = get_settings()
+        if self.settings.DEDUP_ENABLED:
+            validate_lsh_params(self.settings.DEDUP_NUM_PERM, self.settings.DEDUP_BANDS)
         self.embedding_generator = EmbeddingGenerator()
+        self.journal = IngestionJournal(self.settings.JOURNAL_PATH)
+        self.missing = {}
+        self.dedup_stats = {}
         self.client = None
         self.connect_to_qdrant()
         
@@ -35,6 +49,7 @@ class VectorDB:
                 logger.warning(f"Error closing Qdrant connection: {str(e)}")
             finally:
                 self.client = None
+        self.journal.close()
     
     def __enter__(self):
         """Context manager entry"""
@@ -58,6 +73,13 @@ class VectorDB:
                     vectors_config=VectorParams(size=1536, distance=Distance.COSINE)  # OpenAI text-embedding-3-small dimension
                 )
                 logger.info(f"Created new collection: {collection_name}")
+                
+                # Specialists filter on `domain`, so index it for filtered HNSW search
+                self.client.create_payload_index(
+                    collection_name=collection_name,
+                    field_name="domain",
+                    field_schema=PayloadSchemaType.KEYWORD
+                )
         except Exception as e:
             logger.error(f"Failed to create collection {collection_name}: {str(e)}")
             raise e
@@ -71,7 +93,7 @@ class VectorDB:
             logger.error(f"Folder does not exist: {folder_path}")
             return documents
             
-        for file_path in folder.glob("*.md"):
+        for file_path in sorted(folder.glob("*.md")):
             try:
                 with open(file_path, 'r', encoding='utf-8') as file:
                     content = file.read()
@@ -87,10 +109,11 @@ class VectorDB:
         return documents
     
     def upsert_vector(self, collection_name: str, doc_id: str, chunk_text: str, 
-                     embedding: list, filepath: str, chunk_index: int):
+                     embedding: list, filepath: str, chunk_index: int, domain: str = None,
+                     sources: list = None):
         """Insert or update a vector in the collection"""
         try:
-            chunk_id = str(uuid.uuid4())
+            chunk_id = chunk_point_id(doc_id, chunk_index)
             timestamp = get_current_timestamp()
             
             payload = {
@@ -100,9 +123,15 @@ class VectorDB:
                 "document_id": doc_id,
                 "chunk_index": chunk_index,
                 "chunk_text": chunk_text,
-                "filename": os.path.basename(filepath)
+                "filename": os.path.basename(filepath),
+                "domain": domain or collection_name
             }
             
+            # Near-duplicate clusters keep a reference to every source chunk
+            if sources:
+                payload["sources"] = sources
+                payload["duplicate_count"] = len(sources) - 1
+            
             # Check if vector already exists
             search_result = self.client.search(
                 collection_name=collection_name,
@@ -132,17 +161,89 @@ class VectorDB:
             logger.error(f"Failed to upsert vector: {str(e)}")
             raise e
     
-    def process_documents_for_collection(self, folder_name: str, collection_name: str):
-        """Process all documents in a folder and store in specified collection"""
+    def chunk_source(self, doc_id: str, filepath: str, chunk_index: int) -> dict:
+        """Reference to a source chunk, stored on the point of its duplicate cluster"""
+        return {
+            "document_id": doc_id,
+            "filepath": filepath,
+            "filename": os.path.basename(filepath),
+            "chunk_index": chunk_index
+        }
+    
+    def cluster_chunks(self, records: list) -> list:
+        """Group (doc_id, filepath, chunk_index, text) records into near-duplicate clusters"""
+        if not self.settings.DEDUP_ENABLED:
+            return [[record] for record in records]
+        clusters = find_near_duplicate_clusters([record[3] for record in records])
+        return [[records[i] for i in cluster] for cluster in clusters]
+    
+    def cluster_membership(self, cluster: list) -> str:
+        """Membership hash of a cluster of (doc_id, filepath, chunk_index, text) records"""
+        return membership_hash([representative_key(member[0], member[2]) for member in cluster])
+    
+    def cluster_is_written(self, journal_key: str, cluster: list) -> bool:
+        """Whether every member is written to this cluster's point, with the same members as now"""
+        representative = representative_key(cluster[0][0], cluster[0][2])
+        membership = self.cluster_membership(cluster)
+        for doc_id, _, i, _ in cluster:
+            written = self.journal.written_cluster(journal_key, doc_id, i)
+            if written is None or written[0] != representative:
+                return False
+            # Chunks written before membership was journaled are trusted only as single-chunk clusters
+            if written[1] != membership and not (written[1] is None and len(cluster) == 1):
+                return False
+        return True
+    
+    def delete_chunks(self, collection_name: str, chunks: list):
+        """Delete (doc_id, chunk_index) points that no longer exist in the source documents"""
+        if not chunks:
+            return
+        self.client.delete(
+            collection_name=collection_name,
+            points_selector=PointIdsList(points=[chunk_point_id(doc_id, i) for doc_id, i in chunks])
+        )
+        logger.info(f"Deleted {len(chunks)} stale chunks from {collection_name}")
+    
+    def process_documents_for_collection(self, folder_name: str, collection_name: str, domain: str = None):
+        """Process all documents in a folder and store in specified collection.
+        
+        Progress is checkpointed in the ingestion journal: chunks already written are
+        skipped, so an interrupted run resumes where it stopped, and failed chunks are
+        retried up to INGEST_MAX_RETRIES times.
+        
+        In the consolidated layout several domains share one collection; `domain` is then
+        stored on every point and each domain is journaled separately.
+        """
         folder_path = os.path.join(self.settings.DATA_PATH, folder_name)
         logger.info(f"Processing documents from: {folder_path}")
         
+        # A missing folder (e.g. a wrong DATA_PATH) must not be mistaken for deleted documents
+        if not os.path.isdir(folder_path):
+            logger.error(f"Folder does not exist: {folder_path}. Skipping processing.")
+            return
+        
+        domain = domain or collection_name
+        journal_key = collection_name if domain == collection_name else f"{collection_name}/{domain}"
+        
         # Check if collection exists first
-        if self.client.collection_exists(collection_name):
-            logger.info(f"Collection {collection_name} already exists. Skipping processing.")
+        if not self.client.collection_exists(collection_name):
+            # The collection was dropped or its storage wiped: nothing journaled is in Qdrant anymore
+            if self.journal.has_collection(journal_key):
+                logger.warning(f"Collection {collection_name} is missing. Resetting its ingestion journal.")
+            self.journal.reset_collection(collection_name)
+        elif self.journal.is_complete(journal_key):
+            logger.info(f"Collection {journal_key} already exists and is complete. Checking for changes.")
+        elif self.journal.has_collection(journal_key) or domain != collection_name:
+            logger.info(f"Collection {journal_key} is incomplete. Resuming ingestion.")
+        else:
+            logger.warning(
+                f"Collection {collection_name} already exists but is not tracked by the ingestion journal. "
+                f"Skipping processing; drop the collection to re-ingest it with checkpointing."
+            )
             return
         
-        # Create collection
+        # Track the collection before creating it, so a crash in between is resumed rather than skipped
+        self.journal.mark_collection(journal_key, completed=False)
         self.create_collection(collection_name)
         
         # Read documents
@@ -150,33 +251,113 @@ class VectorDB:
         
         if not documents:
             logger.warning(f"No documents found in {folder_path}")
-            return
         
-        # Process each document
-        for doc in documents:
-            doc_id = f"{folder_name}_{doc['filename']}"
+        # Forget documents that were removed from disk (files that failed to read are kept)
+        on_disk = [f"{folder_name}_{path.name}" for path in Path(folder_path).glob("*.md")]
+        self.delete_chunks(collection_name, self.journal.prune_documents(journal_key, on_disk))
+        doc_ids = [f"{folder_name}_{doc['filename']}" for doc in documents]
+        
+        # Register every chunk, dropping points whose text changed or no longer exists
+        records = []
+        for doc_id, doc in zip(doc_ids, documents):
             logger.info(f"Processing document: {doc_id}")
             
             # Split into chunks
             chunks = recursive_character_splitting(doc['content'])
-            
-            # Generate embeddings and store
-            for i, chunk in enumerate(chunks):
+            obsolete = self.journal.start_document(journal_key, doc_id, [content_hash(c) for c in chunks])
+            self.delete_chunks(collection_name, [(doc_id, i) for i in obsolete])
+            records.extend((doc_id, doc['filepath'], i, chunk) for i, chunk in enumerate(chunks))
+        
+        # Group near-duplicate chunks; each cluster is embedded and stored once
+        clusters = self.cluster_chunks(records)
+        self.dedup_stats[journal_key] = (len(records), len(clusters))
+        if records:
+            logger.info(
+                f"Near-duplicate detection for {journal_key}: {len(records)} chunks -> {len(clusters)} unique "
+                f"(dedup ratio {1 - len(clusters) / len(records):.1%})"
+            )
+        
+        # A cluster is rewritten when a member is new, changed, moved or gone, so `sources` stays accurate
+        pending = [cluster for cluster in clusters if not self.cluster_is_written(journal_key, cluster)]
+        skipped = len(clusters) - len(pending)
+        if skipped:
+            logger.info(f"Skipping {skipped} chunks already written to {collection_name}")
+        
+        # Generate embeddings and store, retrying failed clusters
+        for attempt in range(1, self.settings.INGEST_MAX_RETRIES + 1):
+            failed = []
+            for cluster in pending:
+                doc_id, filepath, i, chunk = cluster[0]
+                duplicates = cluster[1:]
+                # Duplicates previously stored on their own point must drop it once the cluster is written
+                own_points = [
+                    (member[0], member[2]) for member in duplicates
+                    if self.journal.written_representative(journal_key, member[0], member[2]) == representative_key(member[0], member[2])
+                ]
                 try:
-                    logger.info(f"Processing chunk {i+1}/{len(chunks)} for {doc_id}")
+                    logger.info(f"Processing chunk {i+1} for {doc_id}" + (f" ({len(duplicates)} duplicates)" if duplicates else ""))
                     embedding = self.embedding_generator.generate_embedding(chunk)
                     self.upsert_vector(
                         collection_name=collection_name,
                         doc_id=doc_id,
                         chunk_text=chunk,
                         embedding=embedding,
-                        filepath=doc['filepath'],
-                        chunk_index=i
+                        filepath=filepath,
+                        chunk_index=i,
+                        domain=domain,
+                        sources=[self.chunk_source(*member[:3]) for member in cluster] if duplicates else None
                     )
+                    self.delete_chunks(collection_name, own_points)
+                    membership = self.cluster_membership(cluster)
+                    for member in cluster:
+                        self.journal.mark_written(journal_key, member[0], member[2], representative_key(doc_id, i), membership)
                 except Exception as e:
-                    logger.error(f"Failed to process chunk {i} for {doc_id}: {str(e)}")
+                    logger.error(f"Failed to process chunk {i} for {doc_id} (attempt {attempt}): {str(e)}")
+                    for member in cluster:
+                        self.journal.mark_failed(journal_key, member[0], member[2], str(e))
+                    failed.append(cluster)
+            
+            pending = failed
+            if not pending:
+                break
+            if attempt < self.settings.INGEST_MAX_RETRIES:
+                logger.info(f"Retrying {len(pending)} failed chunks for {collection_name}")
+                time.sleep(self.settings.INGEST_RETRY_BACKOFF * attempt)
         
-        logger.info(f"Completed processing documents for collection: {collection_name}")
+        missing = self.journal.missing_chunks(journal_key)
+        self.journal.mark_collection(journal_key, completed=not missing)
+        self.missing[journal_key] = missing
+        
+        if missing:
+            logger.warning(f"Collection {journal_key} is incomplete: {len(missing)} chunks still missing")
+        else:
+            logger.info(f"Completed processing documents for collection: {journal_key}")
+    
+    def log_ingestion_summary(self):
+        """Log the dedup ratio and every chunk that is still missing after this run"""
+        total_chunks = sum(total for total, _ in self.dedup_stats.values())
+        unique_chunks = sum(unique for _, unique in self.dedup_stats.values())
+        if total_chunks:
+            logger.info(
+                f"Ingestion summary: {total_chunks} chunks, {unique_chunks} unique after near-duplicate detection "
+                f"(dedup ratio {1 - unique_chunks / total_chunks:.1%})"
+            )
+        
+        missing_total = sum(len(missing) for missing in self.missing.values())
+        if not missing_total:
+            logger.info("Ingestion summary: all chunks written")
+            return
+        
+        logger.warning(f"Ingestion summary: {missing_total} chunks still missing (re-run to resume)")
+        for collection_name, missing in self.missing.items():
+            for doc_id, chunk_index, error in missing:
+                logger.warning(f"  {collection_name}: {doc_id} chunk {chunk_index} - {error}")
+    
+    def target_collection(self, collection_name: str) -> str:
+        """Qdrant collection that stores a domain under the configured layout"""
+        if self.settings.COLLECTION_LAYOUT == "consolidated":
+            return self.settings.CONSOLIDATED_COLLECTION
+        return collection_name
     
     def create_all_embeddings(self):
         """Process all document folders and create embeddings"""
@@ -184,11 +365,13 @@ class VectorDB:
         
         for folder_name, collection_name in self.settings.COLLECTIONS.items():
             try:
-                logger.info(f"Processing folder: {folder_name} -> collection: {collection_name}")
-                self.process_documents_for_collection(folder_name, collection_name)
+                target = self.target_collection(collection_name)
+                logger.info(f"Processing folder: {folder_name} -> collection: {target} (domain: {collection_name})")
+                self.process_documents_for_collection(folder_name, target, domain=collection_name)
             except Exception as e:
                 logger.error(f"Failed to process folder {folder_name}: {str(e)}")
         
+        self.log_ingestion_summary()
         logger.info("Completed batch embedding process")
     
     def verify_collections(self):
@@ -196,11 +379,19 @@ class VectorDB:
         logger.info("Verifying collections...")
         
         for folder_name, collection_name in self.settings.COLLECTIONS.items():
+            target = self.target_collection(collection_name)
             try:
-                if self.client.collection_exists(collection_name):
+                if not self.client.collection_exists(target):
+                    logger.warning(f"Collection {target} does not exist")
+                elif target == collection_name:
                     info = self.client.get_collection(collection_name)
                     logger.info(f"Collection {collection_name}: {info.points_count} points")
                 else:
-                    logger.warning(f"Collection {collection_name} does not exist")
+                    count = self.client.count(
+                        collection_name=target,
+                        count_filter=Filter(must=[FieldCondition(key="domain", match=MatchValue(value=collection_name))]),
+                        exact=True
+                    )
+                    logger.info(f"Collection {target} (domain {collection_name}): {count.count} points")
             except Exception as e:
-                logger.error(f"Failed to verify collection {collection_name}: {str(e)}")
\ No newline at end of file
+                logger.error(f"Failed to verify collection {target}: {str(e)}")
\ No newline at end of file
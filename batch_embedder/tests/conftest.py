@@ -0,0 +1,73 @@
+import os
+import sys
+
+import pytest
+
+# Application modules import each other as top-level packages (core, vectordb, embeddings)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
+
+from core.settings import Config
+from vectordb import vectordb as vectordb_module
+from vectordb.journal import IngestionJournal
+
+
+class FakeQdrantClient:
+    """In-memory stand-in for the QdrantClient calls made by VectorDB"""
+
+    def __init__(self, url=None, **kwargs):
+        self.collections = {}
+
+    def collection_exists(self, collection_name):
+        return collection_name in self.collections
+
+    def create_collection(self, collection_name, vectors_config):
+        self.collections[collection_name] = {}
+
+    def create_payload_index(self, **kwargs):
+        pass
+
+    def search(self, **kwargs):
+        return []
+
+    def upsert(self, collection_name, points):
+        for point in points:
+            self.collections[collection_name][point.id] = point.payload
+
+    def delete(self, collection_name, points_selector):
+        for point_id in points_selector.points:
+            self.collections[collection_name].pop(point_id, None)
+
+    def close(self):
+        pass
+
+
+class FakeEmbeddingGenerator:
+    def generate_embedding(self, text):
+        return [float(len(text)), 1.0]
+
+
+@pytest.fixture
+def journal(tmp_path):
+    journal = IngestionJournal(str(tmp_path / "journal.db"))
+    yield journal
+    journal.close()
+
+
+@pytest.fixture
+def data_path(tmp_path):
+    path = tmp_path / "data"
+    (path / "hr-policies").mkdir(parents=True)
+    return path
+
+
+@pytest.fixture
+def vector_db(tmp_path, data_path, monkeypatch):
+    """VectorDB over a fake Qdrant and embedder, reading documents from data_path"""
+    monkeypatch.setattr(vectordb_module, "QdrantClient", FakeQdrantClient)
+    monkeypatch.setattr(vectordb_module, "EmbeddingGenerator", FakeEmbeddingGenerator)
+    monkeypatch.setattr(Config, "JOURNAL_PATH", str(tmp_path / "journal.db"))
+    monkeypatch.setattr(Config, "DATA_PATH", str(data_path))
+    monkeypatch.setattr(Config, "INGEST_RETRY_BACKOFF", 0)
+    db = vectordb_module.VectorDB()
+    yield db
+    db.close()
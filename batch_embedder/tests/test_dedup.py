@@ -0,0 +1,61 @@
+import pytest
+
+from vectordb.dedup import MinHasher, estimated_jaccard, find_near_duplicate_clusters, validate_lsh_params
+
+CONTACT = (
+    "For any question about your benefits, payslips or leave balance, contact the HR service desk at "
+    "hr@example.com or call 555-0100 between 9am and 6pm on business days. Urgent requests outside "
+    "business hours go to the on-call HR partner listed on the intranet."
+)
+
+
+def clusters(texts, threshold=0.85):
+    return find_near_duplicate_clusters(texts, threshold=threshold, num_perm=128, bands=32, shingle_size=3)
+
+
+def test_identical_texts_form_one_cluster():
+    assert clusters([CONTACT, CONTACT]) == [[0, 1]]
+
+
+def test_near_identical_texts_form_one_cluster():
+    near = CONTACT.replace("intranet.", "company intranet!")
+    assert clusters([CONTACT, "Overtime is paid at 150% of the hourly rate.", near]) == [[0, 2], [1]]
+
+
+def test_distinct_texts_stay_apart():
+    texts = [
+        CONTACT,
+        "Overtime is paid at 150% of the hourly rate on weekdays.",
+        "Install the mobile app from the company portal and sign in with your badge.",
+    ]
+    assert clusters(texts) == [[0], [1], [2]]
+
+
+def test_texts_without_words_are_never_clustered():
+    assert clusters(["", "", "---", CONTACT]) == [[0], [1], [2], [3]]
+    assert MinHasher(num_perm=8, shingle_size=3).signature("") is None
+
+
+def test_representative_is_the_earliest_member():
+    near = CONTACT + " Thank you."
+    assert clusters(["Unrelated text about vacations and leave.", near, CONTACT, near]) == [[0], [1, 2, 3]]
+
+
+def test_estimated_jaccard_tracks_similarity():
+    hasher = MinHasher(num_perm=256, shingle_size=3)
+    same = estimated_jaccard(hasher.signature(CONTACT), hasher.signature(CONTACT))
+    other = estimated_jaccard(hasher.signature(CONTACT), hasher.signature("Overtime is paid at 150% of the rate."))
+    assert same == 1.0
+    assert other < 0.2
+
+
+@pytest.mark.parametrize("num_perm, bands", [(128, 0), (128, 256), (128, 48), (0, 1)])
+def test_invalid_lsh_params_are_rejected(num_perm, bands):
+    with pytest.raises(ValueError):
+        validate_lsh_params(num_perm, bands)
+
+
+def test_more_bands_than_permutations_is_rejected():
+    # More bands than permutations leaves zero rows per band, putting every text in one bucket
+    with pytest.raises(ValueError):
+        find_near_duplicate_clusters([CONTACT, CONTACT], threshold=0.85, num_perm=16, bands=32)
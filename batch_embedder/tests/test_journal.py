@@ -0,0 +1,100 @@
+import sqlite3
+
+from vectordb.journal import IngestionJournal, content_hash, membership_hash, representative_key
+
+
+def register(journal, doc_id, texts, collection="hr_policies"):
+    return journal.start_document(collection, doc_id, [content_hash(text) for text in texts])
+
+
+def test_new_chunks_start_pending(journal):
+    assert register(journal, "d", ["a", "b"]) == []
+    assert journal.missing_chunks("hr_policies") == [("d", 0, ""), ("d", 1, "")]
+    assert journal.written_cluster("hr_policies", "d", 0) is None
+
+
+def test_written_chunks_are_kept_on_resume(journal):
+    register(journal, "d", ["a", "b"])
+    journal.mark_written("hr_policies", "d", 0)
+    journal.mark_failed("hr_policies", "d", 1, "boom")
+
+    assert register(journal, "d", ["a", "b"]) == []
+    assert journal.written_representative("hr_policies", "d", 0) == "d#0"
+    assert journal.missing_chunks("hr_policies") == [("d", 1, "boom")]
+
+
+def test_changed_and_removed_chunks_are_obsolete(journal):
+    register(journal, "d", ["a", "b", "c"])
+    for i in range(3):
+        journal.mark_written("hr_policies", "d", i)
+
+    assert register(journal, "d", ["a", "B"]) == [1, 2]
+    assert journal.written_representative("hr_policies", "d", 0) == "d#0"
+    assert journal.written_representative("hr_policies", "d", 1) is None
+    assert journal.missing_chunks("hr_policies") == [("d", 1, "")]
+
+
+def test_prune_forgets_documents_no_longer_on_disk(journal):
+    register(journal, "keep", ["a"])
+    register(journal, "gone", ["b", "c"])
+
+    assert journal.prune_documents("hr_policies", ["keep"]) == [("gone", 0), ("gone", 1)]
+    assert journal.missing_chunks("hr_policies") == [("keep", 0, "")]
+    assert journal.prune_documents("hr_policies", []) == [("keep", 0)]
+
+
+def test_collection_completion(journal):
+    assert not journal.has_collection("hr_policies")
+    journal.mark_collection("hr_policies", completed=False)
+    assert journal.has_collection("hr_policies") and not journal.is_complete("hr_policies")
+    journal.mark_collection("hr_policies", completed=True)
+    assert journal.is_complete("hr_policies")
+
+
+def test_reset_collection_forgets_written_chunks_of_every_domain(journal):
+    for key in ("documents/hr_policies", "documents/labor_rules", "other"):
+        register(journal, "d", ["a"], collection=key)
+        journal.mark_written(key, "d", 0)
+        journal.mark_collection(key, completed=True)
+
+    journal.reset_collection("documents")
+
+    for key in ("documents/hr_policies", "documents/labor_rules"):
+        assert not journal.is_complete(key)
+        assert register(journal, "d", ["a"], collection=key) == []
+        assert journal.written_cluster(key, "d", 0) is None
+        assert journal.missing_chunks(key) == [("d", 0, "")]
+    assert journal.is_complete("other")
+    assert journal.written_representative("other", "d", 0) == "d#0"
+
+
+def test_cluster_members_record_representative_and_membership(journal):
+    register(journal, "a", ["x"])
+    register(journal, "b", ["x"])
+    membership = membership_hash([representative_key("a", 0), representative_key("b", 0)])
+    for doc_id in ("a", "b"):
+        journal.mark_written("hr_policies", doc_id, 0, representative_key("a", 0), membership)
+
+    assert journal.written_cluster("hr_policies", "b", 0) == ("a#0", membership)
+    assert membership_hash(["b#0", "a#0"]) == membership
+    assert membership_hash(["a#0"]) != membership
+
+
+def test_older_journals_are_migrated(tmp_path):
+    path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        """
+        CREATE TABLE chunks (
+            collection TEXT NOT NULL, document_id TEXT NOT NULL, chunk_index INTEGER NOT NULL,
+            content_hash TEXT NOT NULL, status TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0,
+            error TEXT, updated_at TEXT NOT NULL, PRIMARY KEY (collection, document_id, chunk_index)
+        );
+        INSERT INTO chunks VALUES ('hr_policies', 'd', 0, 'h', 'written', 1, NULL, 'now');
+        """
+    )
+    conn.close()
+
+    journal = IngestionJournal(path)
+    assert journal.written_cluster("hr_policies", "d", 0) == ("d#0", None)
+    journal.close()
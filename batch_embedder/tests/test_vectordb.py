@@ -0,0 +1,132 @@
+from vectordb.vectordb import chunk_point_id
+
+CONTACT = (
+    "For any question about your benefits, payslips or leave balance, contact the HR service desk at "
+    "hr@example.com or call 555-0100 between 9am and 6pm on business days. Urgent requests outside "
+    "business hours go to the on-call HR partner listed on the intranet."
+)
+CONTACT_VARIANT = CONTACT.replace("intranet.", "company intranet!")
+
+
+def write(data_path, name, text):
+    (data_path / "hr-policies" / name).write_text(text, encoding="utf-8")
+
+
+def ingest(vector_db):
+    vector_db.process_documents_for_collection("hr-policies", "hr_policies")
+
+
+def points(vector_db):
+    return vector_db.client.collections["hr_policies"]
+
+
+def point(vector_db, doc_id, chunk_index=0):
+    return points(vector_db).get(chunk_point_id(doc_id, chunk_index))
+
+
+def test_failed_chunks_are_retried_on_the_next_run(vector_db, data_path, monkeypatch):
+    write(data_path, "a.md", "Vacation requests need two weeks of notice.")
+    write(data_path, "b.md", "Overtime is paid at 150% of the hourly rate.")
+
+    generate = vector_db.embedding_generator.generate_embedding
+
+    def flaky(text):
+        if text.startswith("Overtime"):
+            raise RuntimeError("rate limited")
+        return generate(text)
+
+    monkeypatch.setattr(vector_db.embedding_generator, "generate_embedding", flaky)
+    ingest(vector_db)
+    assert len(points(vector_db)) == 1
+    assert not vector_db.journal.is_complete("hr_policies")
+    assert vector_db.missing["hr_policies"] == [("hr-policies_b.md", 0, "rate limited")]
+
+    monkeypatch.setattr(vector_db.embedding_generator, "generate_embedding", generate)
+    ingest(vector_db)
+    assert len(points(vector_db)) == 2
+    assert vector_db.journal.is_complete("hr_policies")
+
+
+def test_dropped_collection_is_reingested(vector_db, data_path):
+    write(data_path, "a.md", "Vacation requests need two weeks of notice.")
+    ingest(vector_db)
+    assert vector_db.journal.is_complete("hr_policies")
+
+    # Qdrant storage wiped while the journal survives
+    vector_db.client.collections.clear()
+    ingest(vector_db)
+
+    assert point(vector_db, "hr-policies_a.md") is not None
+    assert vector_db.journal.is_complete("hr_policies")
+
+
+def test_missing_folder_keeps_existing_points(vector_db, data_path):
+    write(data_path, "a.md", "Vacation requests need two weeks of notice.")
+    ingest(vector_db)
+
+    vector_db.settings.DATA_PATH = str(data_path / "wrong")
+    ingest(vector_db)
+
+    assert point(vector_db, "hr-policies_a.md") is not None
+    assert vector_db.journal.written_representative("hr_policies", "hr-policies_a.md", 0) == "hr-policies_a.md#0"
+
+
+def test_near_duplicates_share_one_point(vector_db, data_path):
+    write(data_path, "a.md", CONTACT)
+    write(data_path, "b.md", CONTACT_VARIANT)
+    ingest(vector_db)
+
+    assert len(points(vector_db)) == 1
+    payload = point(vector_db, "hr-policies_a.md")
+    assert payload["duplicate_count"] == 1
+    assert [source["filename"] for source in payload["sources"]] == ["a.md", "b.md"]
+    assert vector_db.dedup_stats["hr_policies"] == (2, 1)
+
+
+def test_cluster_is_rewritten_when_a_member_leaves(vector_db, data_path):
+    write(data_path, "a.md", CONTACT)
+    write(data_path, "b.md", CONTACT_VARIANT)
+    write(data_path, "c.md", CONTACT)
+    ingest(vector_db)
+    assert point(vector_db, "hr-policies_a.md")["duplicate_count"] == 2
+
+    # b's chunk no longer resembles the others
+    write(data_path, "b.md", "Overtime is paid at 150% of the hourly rate.")
+    ingest(vector_db)
+    payload = point(vector_db, "hr-policies_a.md")
+    assert payload["duplicate_count"] == 1
+    assert [source["filename"] for source in payload["sources"]] == ["a.md", "c.md"]
+    assert point(vector_db, "hr-policies_b.md") is not None
+
+    # c is deleted: a is a cluster of its own again
+    (data_path / "hr-policies" / "c.md").unlink()
+    ingest(vector_db)
+    payload = point(vector_db, "hr-policies_a.md")
+    assert "sources" not in payload and "duplicate_count" not in payload
+    assert len(points(vector_db)) == 2
+
+
+def test_duplicate_takes_over_when_the_representative_is_removed(vector_db, data_path):
+    write(data_path, "a.md", CONTACT)
+    write(data_path, "b.md", CONTACT_VARIANT)
+    ingest(vector_db)
+
+    (data_path / "hr-policies" / "a.md").unlink()
+    ingest(vector_db)
+
+    assert point(vector_db, "hr-policies_a.md") is None
+    assert point(vector_db, "hr-policies_b.md")["chunk_text"] == CONTACT_VARIANT
+    assert len(points(vector_db)) == 1
+
+
+def test_unchanged_collection_is_skipped(vector_db, data_path, monkeypatch):
+    write(data_path, "a.md", CONTACT)
+    write(data_path, "b.md", CONTACT_VARIANT)
+    ingest(vector_db)
+
+    calls = []
+    monkeypatch.setattr(vector_db.embedding_generator, "generate_embedding", lambda text: calls.append(text) or [0.0, 1.0])
+    ingest(vector_db)
+
+    assert calls == []
+    assert vector_db.journal.is_complete("hr_policies")
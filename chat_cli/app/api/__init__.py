@@ -0,0 +1,3 @@
+"""
+HTTP API for the RH Team Specialist
+"""
@@ -0,0 +1,140 @@
+# server.py
+"""
+RH Team Specialist HTTP API
+===========================
+Asyncio HTTP service exposing the RH team to many concurrent users:
+* `POST /sessions` creates (or resumes) a conversation
+* `POST /sessions/{session_id}/messages` runs a turn, optionally streamed as SSE
+* `DELETE /sessions/{session_id}` ends a conversation
+
+Runs are bounded by `MAX_CONCURRENT_RUNS`; up to `MAX_QUEUED_RUNS` further
+requests wait for a slot and anything beyond that is rejected with 503.
+"""
+
+import json
+from typing import AsyncIterator, Optional
+
+from fastapi import BackgroundTasks, FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from api.sessions import ChatSession, QueueFullError, RunLimiter, SessionManager
+from teams.rh_team_specialist import build_rh_team_message
+from core.settings import get_settings
+from core.logger import logger
+from core.usage import token_usage
+
+settings = get_settings()
+
+
+class SessionRequest(BaseModel):
+    session_id: Optional[str] = None
+
+
+class MessageRequest(BaseModel):
+    message: str
+    stream: bool = True
+
+
+def _sse(event: str, data: dict) -> str:
+    """Format a single server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def _compact_history(session: ChatSession) -> None:
+    """Fold older turns into the summary once a turn has been answered.
+
+    The summarizer calls the model, so this runs after the answer is delivered and
+    outside the run slot; the session lock keeps it ordered with the next turn.
+    """
+    async with session.lock:
+        await session.history.acompact()
+
+
+async def _stream_turn(session: ChatSession, limiter: RunLimiter, message: str) -> AsyncIterator[str]:
+    """Run one turn for a session and yield the answer as SSE token events."""
+    try:
+        # Wait for the session before taking a run slot, so a queued turn of a busy session never holds one
+        async with session.lock, limiter.slot():
+            content = ""
+            prompt = build_rh_team_message(session.team, session.history, message)
+            response_stream = await session.team.arun(prompt, stream=True, session_id=session.session_id)
+            async for chunk in response_stream:
+                delta = getattr(chunk, "content", None)
+                if isinstance(delta, str) and delta:
+                    content += delta
+                    yield _sse("token", {"content": delta})
+            usage = token_usage(session.team.run_response)
+            logger.info(f"Session {session.session_id} token usage: {usage}")
+            if content:
+                await session.history.arecord(message, content)
+            yield _sse("done", {"session_id": session.session_id, "content": content, "usage": usage.to_dict()})
+        await _compact_history(session)
+    except QueueFullError as e:
+        yield _sse("error", {"detail": str(e)})
+    except Exception as e:
+        logger.error(f"Error streaming turn for session {session.session_id}: {str(e)}")
+        yield _sse("error", {"detail": str(e)})
+    finally:
+        session.touch()
+
+
+def create_app() -> FastAPI:
+    """Create the FastAPI application with its session registry and run limiter."""
+    app = FastAPI(title="RH Team Specialist API")
+    sessions = SessionManager(settings.MAX_SESSIONS, settings.SESSION_TTL_SECONDS)
+    limiter = RunLimiter(settings.MAX_CONCURRENT_RUNS, settings.MAX_QUEUED_RUNS)
+
+    @app.get("/health")
+    async def health() -> dict:
+        return {
+            "status": "ok",
+            "sessions": len(sessions),
+            "running": limiter.running,
+            "waiting": limiter.waiting,
+        }
+
+    @app.post("/sessions", status_code=201)
+    async def create_session(request: SessionRequest) -> dict:
+        session = sessions.create(request.session_id)
+        return {"session_id": session.session_id}
+
+    @app.delete("/sessions/{session_id}", status_code=204)
+    async def delete_session(session_id: str) -> None:
+        if not sessions.delete(session_id):
+            raise HTTPException(status_code=404, detail="Session not found")
+
+    @app.post("/sessions/{session_id}/messages")
+    async def send_message(session_id: str, request: MessageRequest, background_tasks: BackgroundTasks):
+        session = sessions.get_or_resume(session_id)
+        if session is None:
+            raise HTTPException(status_code=404, detail="Session not found")
+        if limiter.is_saturated():
+            raise HTTPException(status_code=503, detail="Too many requests in progress, try again later")
+
+        logger.info(f"Processing question for session {session_id}: {request.message}")
+
+        if request.stream:
+            return StreamingResponse(
+                _stream_turn(session, limiter, request.message),
+                media_type="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+            )
+
+        try:
+            async with session.lock, limiter.slot():
+                prompt = build_rh_team_message(session.team, session.history, request.message)
+                response = await session.team.arun(prompt, session_id=session.session_id)
+                if response.content:
+                    await session.history.arecord(request.message, str(response.content))
+        except QueueFullError as e:
+            raise HTTPException(status_code=503, detail=str(e))
+        finally:
+            session.touch()
+
+        background_tasks.add_task(_compact_history, session)
+        usage = token_usage(response)
+        logger.info(f"Session {session.session_id} token usage: {usage}")
+        return {"session_id": session.session_id, "content": response.content, "usage": usage.to_dict()}
+
+    return app
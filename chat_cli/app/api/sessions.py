@@ -0,0 +1,153 @@
+# sessions.py
+"""
+Chat Sessions and Run Limiting
+==============================
+Per-session state for the HTTP API:
+* One RH team and one persisted `ConversationHistory` per session
+* A per-session lock so turns of the same conversation run in order
+* A process-wide limiter that bounds concurrent runs and queued requests
+
+The agents of every session share the cached vector databases, embedder and
+Qdrant client from `vectordb.qdrant_factory`, so a new session only allocates
+lightweight Agno objects. Evicted sessions keep their history in the session
+store and are resumed transparently on their next request.
+"""
+
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Optional
+
+from agno.team import Team
+
+from teams.rh_team_specialist import create_rh_team
+from history.manager import ConversationHistory, get_session_store
+from core.logger import logger
+
+
+class QueueFullError(RuntimeError):
+    """Raised when a run cannot even be queued because the wait queue is full."""
+
+
+@dataclass
+class ChatSession:
+    """State kept for a single conversation."""
+    session_id: str
+    team: Team
+    history: ConversationHistory
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    last_used: float = field(default_factory=time.monotonic)
+
+    def touch(self) -> None:
+        self.last_used = time.monotonic()
+
+
+class SessionManager:
+    """In-memory registry of chat sessions with LRU and idle-time eviction."""
+
+    def __init__(self, max_sessions: int, ttl_seconds: int):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self._sessions: "OrderedDict[str, ChatSession]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def create(self, session_id: Optional[str] = None) -> ChatSession:
+        """Create a session, or return the existing one with the same id."""
+        session_id = session_id or str(uuid.uuid4())
+        existing = self.get(session_id)
+        if existing is not None:
+            return existing
+
+        self._evict()
+        # Persist the id right away: an evicted session is resumed from the store even before its first turn
+        get_session_store().register(session_id)
+        session = ChatSession(
+            session_id=session_id,
+            team=create_rh_team(),
+            history=ConversationHistory(session_id),
+        )
+        self._sessions[session_id] = session
+        logger.info(f"Created chat session {session_id} ({len(self._sessions)} active)")
+        return session
+
+    def get(self, session_id: str) -> Optional[ChatSession]:
+        """Return a session and mark it as most recently used."""
+        session = self._sessions.get(session_id)
+        if session is not None:
+            session.touch()
+            self._sessions.move_to_end(session_id)
+        return session
+
+    def get_or_resume(self, session_id: str) -> Optional[ChatSession]:
+        """Return an active session, or reload it from the session store."""
+        session = self.get(session_id)
+        if session is None and get_session_store().exists(session_id):
+            session = self.create(session_id)
+        return session
+
+    def delete(self, session_id: str) -> bool:
+        """Drop a session and its persisted history. Returns False if it did not exist."""
+        store = get_session_store()
+        existed = session_id in self._sessions or store.exists(session_id)
+        self._sessions.pop(session_id, None)
+        store.delete(session_id)
+        if existed:
+            logger.info(f"Deleted chat session {session_id}")
+        return existed
+
+    def _evict(self) -> None:
+        """Drop idle sessions, then the least recently used ones above the limit."""
+        now = time.monotonic()
+        for session_id, session in list(self._sessions.items()):
+            if session.lock.locked():
+                continue
+            if now - session.last_used > self.ttl_seconds or len(self._sessions) >= self.max_sessions:
+                del self._sessions[session_id]
+                logger.info(f"Evicted chat session {session_id}")
+
+
+class RunLimiter:
+    """Bound the number of concurrent team runs and of requests waiting for one."""
+
+    def __init__(self, max_concurrent: int, max_queued: int):
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._running = 0
+        self._waiting = 0
+
+    @property
+    def running(self) -> int:
+        return self._running
+
+    @property
+    def waiting(self) -> int:
+        return self._waiting
+
+    def is_saturated(self) -> bool:
+        """True when every run slot is busy and the wait queue is full."""
+        return self._running >= self.max_concurrent and self._waiting >= self.max_queued
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Wait for a free run slot, or raise QueueFullError if the queue is full."""
+        if self.is_saturated():
+            raise QueueFullError("Too many requests in progress, try again later")
+
+        self._waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+
+        self._running += 1
+        try:
+            yield
+        finally:
+            self._running -= 1
+            self._semaphore.release()
@@ -10,6 +10,18 @@ class Config:
     
     # Qdrant Configuration
     QDRANT_URL: str = environ.get("QDRANT_URL", "http://localhost:6333")
+    QDRANT_PATH: str = environ.get("QDRANT_PATH", "")  # Local mode (path or ":memory:"), overrides QDRANT_URL
+    
+    # Search-time Qdrant Configuration (tune with chat_cli/app/recall_bench.py)
+    QDRANT_HNSW_EF: int = int(environ.get("QDRANT_HNSW_EF", "0"))  # 0 keeps the collection default
+    QDRANT_EXACT_SEARCH: bool = environ.get("QDRANT_EXACT_SEARCH", "false").lower() == "true"
+    QDRANT_QUANTIZATION_RESCORE: bool = environ.get("QDRANT_QUANTIZATION_RESCORE", "true").lower() == "true"
+    
+    # Vector Backend: "qdrant", "numpy" (in-process, memory-mapped) or "auto"
+    # (numpy for collections up to NUMPY_BACKEND_MAX_POINTS points, qdrant otherwise)
+    VECTOR_BACKEND: str = environ.get("VECTOR_BACKEND", "qdrant")
+    NUMPY_BACKEND_MAX_POINTS: int = int(environ.get("NUMPY_BACKEND_MAX_POINTS", "20000"))
+    NUMPY_BACKEND_CACHE_DIR: str = environ.get("NUMPY_BACKEND_CACHE_DIR", ".vector_cache")
     
     # Collections Configuration
     COLLECTIONS = {
@@ -18,11 +30,35 @@ class Config:
         "product_manual": "product_manual"
     }
     
+    # Collection Layout: "separate" (one collection per domain) or "consolidated"
+    # (all domains in CONSOLIDATED_COLLECTION, filtered on the indexed `domain` payload)
+    COLLECTION_LAYOUT: str = environ.get("COLLECTION_LAYOUT", "separate")
+    CONSOLIDATED_COLLECTION: str = environ.get("CONSOLIDATED_COLLECTION", "documents")
+    
     # Team Configuration
     NUM_DOCUMENTS: int = int(environ.get("NUM_DOCUMENTS", "4"))
     NUM_HISTORY_RUNS: int = int(environ.get("NUM_HISTORY_RUNS", "5"))
     ENABLE_STREAMING: bool = environ.get("ENABLE_STREAMING", "true").lower() == "true"
     
+    # Rendering Configuration
+    INCREMENTAL_RENDERING: bool = environ.get("INCREMENTAL_RENDERING", "true").lower() == "true"
+    STREAM_RENDER_FPS: int = int(environ.get("STREAM_RENDER_FPS", "12"))
+    SHOW_LATENCY_FOOTER: bool = environ.get("SHOW_LATENCY_FOOTER", "true").lower() == "true"
+    
+    # History Configuration
+    HISTORY_DB_PATH: str = environ.get("HISTORY_DB_PATH", "chat_history.db")
+    HISTORY_SUMMARY_TOKENS: int = int(environ.get("HISTORY_SUMMARY_TOKENS", "500"))
+    HISTORY_SUMMARY_MODEL_ID: str = environ.get("HISTORY_SUMMARY_MODEL_ID", CHAT_MODEL_ID)
+    CHAT_SESSION_ID: str = environ.get("CHAT_SESSION_ID", "cli")
+    
+    # API Server Configuration
+    API_HOST: str = environ.get("API_HOST", "0.0.0.0")
+    API_PORT: int = int(environ.get("API_PORT", "8000"))
+    MAX_CONCURRENT_RUNS: int = int(environ.get("MAX_CONCURRENT_RUNS", "16"))
+    MAX_QUEUED_RUNS: int = int(environ.get("MAX_QUEUED_RUNS", "64"))
+    MAX_SESSIONS: int = int(environ.get("MAX_SESSIONS", "256"))
+    SESSION_TTL_SECONDS: int = int(environ.get("SESSION_TTL_SECONDS", "3600"))
+    
     # Debug Configuration
     DEBUG_MODE: bool = environ.get("DEBUG_MODE", "false").lower() == "true"
     SHOW_MEMBERS_RESPONSES: bool = environ.get("SHOW_MEMBERS_RESPONSES", "true").lower() == "true"
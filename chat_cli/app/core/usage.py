@@ -0,0 +1,49 @@
+# usage.py
+"""
+Token Usage Reporting
+=====================
+Sums prompt and cached prompt tokens over a team run and its member runs, so the
+effect of provider-side prompt-prefix caching can be verified per turn.
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass
+class TokenUsage:
+    prompt_tokens: int = 0
+    cached_tokens: int = 0
+
+    @property
+    def cached_ratio(self) -> float:
+        return self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
+
+    def to_dict(self) -> dict:
+        return {"prompt_tokens": self.prompt_tokens, "cached_tokens": self.cached_tokens}
+
+    def __str__(self) -> str:
+        return f"prompt {self.prompt_tokens} tokens ({self.cached_tokens} cached, {self.cached_ratio:.0%})"
+
+
+def _total(value: Any) -> int:
+    """Agno stores run metrics as one value per model call; accept lists or scalars."""
+    if isinstance(value, (list, tuple)):
+        return sum(_total(v) for v in value)
+    if isinstance(value, dict):
+        return _total(value.get("cached_tokens"))
+    return int(value or 0)
+
+
+def token_usage(run_response: Any) -> TokenUsage:
+    """Prompt and cached prompt tokens of a (team) run response, including member runs."""
+    usage = TokenUsage()
+    if run_response is None:
+        return usage
+
+    for response in [run_response, *(getattr(run_response, "member_responses", None) or [])]:
+        metrics = getattr(response, "metrics", None) or {}
+        usage.prompt_tokens += _total(metrics.get("input_tokens") or metrics.get("prompt_tokens"))
+        cached = metrics.get("cached_tokens") or metrics.get("prompt_tokens_details")
+        usage.cached_tokens += _total(cached)
+    return usage
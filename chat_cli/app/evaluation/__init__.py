@@ -0,0 +1,3 @@
+"""
+Retrieval quality evaluation for Chat CLI
+"""
@@ -0,0 +1,249 @@
+# recall.py
+"""
+Recall vs Latency Evaluation
+============================
+Measures how much retrieval quality each search-time setting costs or buys:
+* Exports a collection (vectors and payloads) with `scroll`
+* Computes exact top-k neighbours with vectorized NumPy as ground truth
+* Replays the same queries against Qdrant for every `SearchConfig` in a sweep
+  (HNSW `ef`, exact search, quantization rescoring, result limit)
+* Reports recall@k next to p50/p95 latency and throughput per configuration
+
+Vectors are L2-normalized before the dot product, matching Qdrant's cosine distance.
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence
+
+import numpy as np
+from qdrant_client import QdrantClient
+from qdrant_client.http.models import (
+    FieldCondition, Filter, MatchValue, QuantizationSearchParams, SearchParams,
+)
+
+
+@dataclass
+class CollectionExport:
+    collection: str
+    ids: List[str]
+    vectors: np.ndarray
+    payloads: List[dict] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+@dataclass
+class SearchConfig:
+    limit: int
+    hnsw_ef: Optional[int] = None
+    exact: bool = False
+    rescore: bool = True
+
+    @property
+    def label(self) -> str:
+        if self.exact:
+            return "exact"
+        label = f"ef={self.hnsw_ef}" if self.hnsw_ef else "ef=default"
+        if not self.rescore:
+            label += ", no rescore"
+        return label
+
+    def search_params(self) -> SearchParams:
+        return SearchParams(
+            hnsw_ef=self.hnsw_ef,
+            exact=self.exact,
+            quantization=QuantizationSearchParams(rescore=self.rescore),
+        )
+
+
+@dataclass
+class ConfigResult:
+    config: SearchConfig
+    recall: float
+    latencies: List[float]
+
+    @property
+    def p50(self) -> float:
+        return float(np.percentile(self.latencies, 50)) if self.latencies else 0.0
+
+    @property
+    def p95(self) -> float:
+        return float(np.percentile(self.latencies, 95)) if self.latencies else 0.0
+
+    @property
+    def qps(self) -> float:
+        total = sum(self.latencies)
+        return len(self.latencies) / total if total else 0.0
+
+
+def normalize(matrix: np.ndarray) -> np.ndarray:
+    """Row-wise L2 normalization (zero rows stay zero)."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1.0, norms)
+
+
+def domain_filter(domain: Optional[str]) -> Optional[Filter]:
+    """Filter on the `domain` payload (consolidated layout), or None."""
+    if not domain:
+        return None
+    return Filter(must=[FieldCondition(key="domain", match=MatchValue(value=domain))])
+
+
+def export_collection(
+    client: QdrantClient,
+    collection: str,
+    domain: Optional[str] = None,
+    batch_size: int = 256,
+) -> CollectionExport:
+    """Read every point (optionally of one domain) with its vector and payload."""
+    ids, vectors, payloads = [], [], []
+    offset = None
+    while True:
+        points, offset = client.scroll(
+            collection_name=collection,
+            scroll_filter=domain_filter(domain),
+            limit=batch_size,
+            offset=offset,
+            with_payload=True,
+            with_vectors=True,
+        )
+        for point in points:
+            ids.append(str(point.id))
+            vectors.append(point.vector)
+            payloads.append(point.payload or {})
+        if offset is None:
+            break
+
+    matrix = normalize(np.asarray(vectors, dtype=np.float32)) if vectors else np.empty((0, 0), dtype=np.float32)
+    return CollectionExport(collection=collection, ids=ids, vectors=matrix, payloads=payloads)
+
+
+def exact_top_k(
+    vectors: np.ndarray,
+    queries: np.ndarray,
+    k: int,
+    exclude: Optional[Sequence[int]] = None,
+) -> np.ndarray:
+    """Row indices of the k most similar vectors per query, best first.
+
+    `exclude` optionally gives, per query, a row to leave out (the query's own point
+    when queries are sampled from the collection); it is never returned, so at most
+    n - 1 rows come back.
+    """
+    scores = normalize(queries.astype(np.float32)) @ vectors.T
+    if exclude is not None:
+        scores[np.arange(len(queries)), np.asarray(exclude)] = -np.inf
+    k = min(k, vectors.shape[0] - (1 if exclude is not None else 0))
+    if k <= 0:
+        return np.empty((len(queries), 0), dtype=np.int64)
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1)
+    return np.take_along_axis(top, order, axis=1)
+
+
+def ann_bypass_reason(client: QdrantClient, export: CollectionExport, domain: Optional[str] = None) -> Optional[str]:
+    """Why Qdrant would answer every query of this export by full scan, or None.
+
+    Unindexed segments (below `indexing_threshold`) and filtered searches matching
+    fewer vectors than `full_scan_threshold` covers skip HNSW, so `ef` has no effect.
+    """
+    info = client.get_collection(export.collection)
+    if not info.indexed_vectors_count:
+        threshold = info.config.optimizer_config.indexing_threshold
+        return (
+            f"no vectors are HNSW-indexed yet (indexing_threshold={threshold} KB), "
+            "so every search is a full scan"
+        )
+
+    vector_kb = export.vectors.shape[1] * 4 / 1024 if export.vectors.size else 0
+    full_scan_kb = info.config.hnsw_config.full_scan_threshold
+    if domain and len(export) * vector_kb < full_scan_kb:
+        return (
+            f"the domain filter matches {len(export)} points, under full_scan_threshold={full_scan_kb} KB, "
+            "so filtered searches are full scans"
+        )
+    return None
+
+
+def sample_queries(export: CollectionExport, count: int, seed: int = 0) -> np.ndarray:
+    """Random row indices of the export to use as queries."""
+    rng = np.random.default_rng(seed)
+    return rng.choice(len(export), size=min(count, len(export)), replace=False)
+
+
+def build_sweep(
+    limits: Sequence[int],
+    ef_values: Sequence[int],
+    quantization: bool = False,
+) -> List[SearchConfig]:
+    """Exact baseline plus one config per HNSW ef (with and without quantization rescoring) for each limit."""
+    configs: List[SearchConfig] = []
+    for limit in limits:
+        configs.append(SearchConfig(limit=limit, exact=True))
+        for ef in ef_values:
+            configs.append(SearchConfig(limit=limit, hnsw_ef=ef or None))
+            if quantization:
+                configs.append(SearchConfig(limit=limit, hnsw_ef=ef or None, rescore=False))
+    return configs
+
+
+def evaluate(
+    client: QdrantClient,
+    export: CollectionExport,
+    queries: np.ndarray,
+    configs: Sequence[SearchConfig],
+    exclude: Optional[Sequence[int]] = None,
+    domain: Optional[str] = None,
+    warmup: int = 5,
+) -> List[ConfigResult]:
+    """Run every config over the queries and score recall@limit against exact neighbours."""
+    max_limit = max(config.limit for config in configs)
+    truth_rows = exact_top_k(export.vectors, queries, max_limit, exclude)
+    truth_ids = [[export.ids[row] for row in rows] for rows in truth_rows]
+    self_ids = [export.ids[row] for row in exclude] if exclude is not None else [None] * len(queries)
+    query_filter = domain_filter(domain)
+    query_vectors = [vector.tolist() for vector in queries]
+
+    results: List[ConfigResult] = []
+    for config in configs:
+        params = config.search_params()
+        # Ask for one extra hit when the query's own point must be skipped
+        limit = config.limit + (1 if exclude is not None else 0)
+
+        def search(vector: list):
+            return client.search(
+                collection_name=export.collection,
+                query_vector=vector,
+                query_filter=query_filter,
+                limit=limit,
+                search_params=params,
+                with_payload=False,
+            )
+
+        for vector in query_vectors[:warmup]:
+            search(vector)
+
+        latencies, hits = [], 0
+        for vector, expected, self_id in zip(query_vectors, truth_ids, self_ids):
+            start = time.perf_counter()
+            found = search(vector)
+            latencies.append(time.perf_counter() - start)
+
+            found_ids = [str(point.id) for point in found if str(point.id) != self_id][:config.limit]
+            hits += len(set(found_ids) & set(expected[:config.limit]))
+
+        expected_total = sum(min(config.limit, len(expected)) for expected in truth_ids)
+        results.append(ConfigResult(
+            config=config,
+            recall=hits / expected_total if expected_total else 0.0,
+            latencies=latencies,
+        ))
+    return results
+
+
+def fastest_meeting_target(results: Sequence[ConfigResult], target: float, limit: int) -> Optional[ConfigResult]:
+    """Lowest p50 configuration with the given limit whose recall reaches the target."""
+    eligible = [r for r in results if r.config.limit == limit and r.recall >= target]
+    return min(eligible, key=lambda r: r.p50) if eligible else None
@@ -0,0 +1,3 @@
+"""
+Conversation history management for Chat CLI
+"""
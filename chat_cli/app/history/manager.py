@@ -0,0 +1,149 @@
+# manager.py
+"""
+Bounded Conversation History
+============================
+Keeps prompt size flat as conversations grow:
+* The last `NUM_HISTORY_RUNS` turns are kept verbatim
+* Older turns are folded into a running summary capped at `HISTORY_SUMMARY_TOKENS`
+* Compaction runs in batches: once twice `NUM_HISTORY_RUNS` turns have accumulated, the
+  older half is folded in one summarizer call, instead of one call on every turn
+* Everything is persisted in the SQLite `SessionStore`, so sessions resume after a restart
+
+`record` only persists the turn. Callers run `compact` once the answer has been
+delivered, so the summarizer's model call never adds to a turn's latency.
+"""
+
+import asyncio
+from typing import Callable, List, Optional
+
+from agno.agent import Agent
+from agno.models.openai import OpenAIChat
+
+from history.store import SessionStore, Turn
+from core.settings import get_settings
+from core.logger import logger
+
+settings = get_settings()
+
+Summarizer = Callable[[str, List[Turn], int], str]
+
+_store: Optional[SessionStore] = None
+
+
+def get_session_store() -> SessionStore:
+    """Return the process-wide session store, opening it on first use."""
+    global _store
+    if _store is None:
+        _store = SessionStore(settings.HISTORY_DB_PATH)
+    return _store
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for English text)."""
+    return (len(text) + 3) // 4
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Trim text so that its estimated token count fits in max_tokens."""
+    max_chars = max_tokens * 4
+    if len(text) <= max_chars:
+        return text
+    return text[:max_chars].rsplit(" ", 1)[0].rstrip() + " …"
+
+
+def _format_turns(turns: List[Turn]) -> str:
+    return "\n\n".join(f"User: {turn.question}\nAssistant: {turn.answer}" for turn in turns)
+
+
+def summarize_turns(summary: str, turns: List[Turn], max_tokens: int) -> str:
+    """Fold older turns into the running summary using the chat model."""
+    summarizer = Agent(
+        model=OpenAIChat(id=settings.HISTORY_SUMMARY_MODEL_ID, max_tokens=max_tokens),
+        instructions=(
+            "You maintain a compact summary of a conversation between an employee and a company "
+            "assistant covering HR policies, labor rules and product manuals. Merge the new turns "
+            f"into the existing summary in at most {max_tokens} tokens. Keep facts, decisions, "
+            "names, numbers and open questions; drop greetings and repetition. "
+            "Reply with the updated summary only."
+        ),
+    )
+    prompt = (
+        f"Existing summary:\n{summary or '(empty)'}\n\n"
+        f"New turns:\n{_format_turns(turns)}"
+    )
+    response = summarizer.run(prompt)
+    return str(response.content or "").strip()
+
+
+class ConversationHistory:
+    """Recent turns verbatim plus a token-budgeted summary of everything older."""
+
+    def __init__(
+        self,
+        session_id: str,
+        store: Optional[SessionStore] = None,
+        max_recent_turns: Optional[int] = None,
+        summary_token_budget: Optional[int] = None,
+        summarizer: Optional[Summarizer] = None,
+    ):
+        self.session_id = session_id
+        self.store = store or get_session_store()
+        self.max_recent_turns = max_recent_turns if max_recent_turns is not None else settings.NUM_HISTORY_RUNS
+        self.summary_token_budget = summary_token_budget or settings.HISTORY_SUMMARY_TOKENS
+        self.summarizer = summarizer or summarize_turns
+        self.summary, self.turns = self.store.load(session_id)
+        if self.summary or self.turns:
+            logger.info(f"Resumed session {session_id} with {len(self.turns)} recent turns")
+
+    def render(self) -> Optional[str]:
+        """Render the history as context for the next run, or None if empty."""
+        parts = []
+        if self.summary:
+            parts.append(f"<conversation_summary>\n{self.summary}\n</conversation_summary>")
+        if self.turns:
+            parts.append(f"<recent_turns>\n{_format_turns(self.turns)}\n</recent_turns>")
+        return "\n".join(parts) or None
+
+    @property
+    def needs_compaction(self) -> bool:
+        """True once twice the verbatim limit has accumulated (at least one turn over it)."""
+        return len(self.turns) >= max(2 * self.max_recent_turns, self.max_recent_turns + 1)
+
+    def record(self, question: str, answer: str) -> None:
+        """Persist a finished turn; older turns are folded later by compact."""
+        self.turns.append(self.store.append_turn(self.session_id, question, answer))
+
+    async def arecord(self, question: str, answer: str) -> None:
+        """Async variant of record, keeping the SQLite write off the event loop."""
+        await asyncio.to_thread(self.record, question, answer)
+
+    def compact(self) -> None:
+        """Fold all but the last `max_recent_turns` turns into the summary, if due."""
+        if self.needs_compaction:
+            self._compact()
+
+    async def acompact(self) -> None:
+        """Async variant of compact; the summarizer calls the model, so run it off the event loop."""
+        await asyncio.to_thread(self.compact)
+
+    def clear(self) -> None:
+        """Forget the whole session, in memory and on disk."""
+        self.store.delete(self.session_id)
+        self.summary, self.turns = "", []
+
+    def _compact(self) -> None:
+        overflow = self.turns[: len(self.turns) - self.max_recent_turns]
+        try:
+            summary = self.summarizer(self.summary, overflow, self.summary_token_budget)
+        except Exception as e:
+            # Keep the turns verbatim and retry on the next turn rather than losing them
+            logger.warning(f"Failed to compact history for session {self.session_id}: {str(e)}")
+            return
+
+        self.summary = truncate_to_tokens(summary, self.summary_token_budget)
+        self.store.compact(self.session_id, self.summary, [turn.id for turn in overflow])
+        self.turns = self.turns[len(overflow):]
+        logger.info(
+            f"Compacted {len(overflow)} turns for session {self.session_id} "
+            f"(summary ~{estimate_tokens(self.summary)} tokens)"
+        )
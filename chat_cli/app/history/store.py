@@ -0,0 +1,126 @@
+# store.py
+"""
+SQLite Session Store
+====================
+Persists conversation state so sessions survive process restarts:
+* `sessions` holds the compacted summary of older turns
+* `turns` holds the recent turns kept verbatim
+"""
+
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import List, Tuple
+
+from core.logger import logger
+
+
+@dataclass
+class Turn:
+    """A single question/answer exchange."""
+    id: int
+    question: str
+    answer: str
+
+
+class SessionStore:
+    """Thread-safe SQLite store for conversation summaries and turns."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS sessions (
+                session_id TEXT PRIMARY KEY,
+                summary TEXT NOT NULL DEFAULT '',
+                updated_at TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS turns (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id TEXT NOT NULL,
+                question TEXT NOT NULL,
+                answer TEXT NOT NULL,
+                created_at TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_turns_session ON turns (session_id, id);
+            """
+        )
+        self._conn.commit()
+        logger.info(f"Opened session store at {db_path}")
+
+    def close(self):
+        """Close the SQLite connection"""
+        with self._lock:
+            self._conn.close()
+
+    def exists(self, session_id: str) -> bool:
+        """Check whether a session has any persisted state"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        return row is not None
+
+    def register(self, session_id: str):
+        """Persist a session before its first turn, so it can be resumed once issued"""
+        with self._lock, self._conn:
+            self._upsert_session(session_id, _now())
+
+    def load(self, session_id: str) -> Tuple[str, List[Turn]]:
+        """Return the summary and verbatim turns of a session (oldest first)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT summary FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            rows = self._conn.execute(
+                "SELECT id, question, answer FROM turns WHERE session_id = ? ORDER BY id",
+                (session_id,),
+            ).fetchall()
+        summary = row[0] if row else ""
+        return summary, [Turn(id=r[0], question=r[1], answer=r[2]) for r in rows]
+
+    def append_turn(self, session_id: str, question: str, answer: str) -> Turn:
+        """Persist a new verbatim turn"""
+        now = _now()
+        with self._lock, self._conn:
+            self._upsert_session(session_id, now)
+            cursor = self._conn.execute(
+                "INSERT INTO turns (session_id, question, answer, created_at) VALUES (?, ?, ?, ?)",
+                (session_id, question, answer, now),
+            )
+        return Turn(id=cursor.lastrowid, question=question, answer=answer)
+
+    def compact(self, session_id: str, summary: str, turn_ids: List[int]):
+        """Atomically replace the summary and drop the turns folded into it"""
+        now = _now()
+        with self._lock, self._conn:
+            self._upsert_session(session_id, now)
+            self._conn.execute(
+                "UPDATE sessions SET summary = ?, updated_at = ? WHERE session_id = ?",
+                (summary, now, session_id),
+            )
+            self._conn.executemany(
+                "DELETE FROM turns WHERE session_id = ? AND id = ?",
+                [(session_id, turn_id) for turn_id in turn_ids],
+            )
+
+    def delete(self, session_id: str):
+        """Remove every trace of a session"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM turns WHERE session_id = ?", (session_id,))
+            self._conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+    def _upsert_session(self, session_id: str, now: str):
+        self._conn.execute(
+            "INSERT INTO sessions (session_id, updated_at) VALUES (?, ?) "
+            "ON CONFLICT(session_id) DO UPDATE SET updated_at = excluded.updated_at",
+            (session_id, now),
+        )
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
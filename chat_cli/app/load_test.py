@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Chat Load Test
+==============
+Offline load generator for the RH Team Specialist. Starts a local mock of the
+OpenAI API, points the team and an in-process Qdrant (local mode) at it, and
+replays a question set at the requested concurrency.
+
+Example:
+    python chat_cli/app/load_test.py --concurrency 32 --turns 200 --latency-ms 400
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+
+# Add the app directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from rich.console import Console
+from rich.table import Table
+
+from loadtest.mock_openai import MockConfig, MockOpenAIServer
+
+console = Console()
+
+DEFAULT_QUESTIONS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "loadtest", "questions.txt")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Load test the RH team against a local OpenAI stand-in")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32], help="Virtual users (one run per value)")
+    parser.add_argument("--turns", type=int, default=64, help="Turns per run")
+    parser.add_argument("--questions", default=DEFAULT_QUESTIONS, help="File with one question per line")
+    parser.add_argument("--data-path", default=os.environ.get("DATA_PATH", "./data"), help="Markdown corpus to seed Qdrant with")
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="Mock time to first byte per request")
+    parser.add_argument("--token-delay-ms", type=float, default=15.0, help="Mock delay between streamed chunks")
+    parser.add_argument("--answer-tokens", type=int, default=120, help="Words per mock answer")
+    parser.add_argument("--tool-call-rate", type=float, default=1.0, help="Probability of a tool call on a fresh user turn")
+    parser.add_argument("--no-stream", action="store_true", help="Measure non-streaming runs")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    with open(args.questions, encoding="utf-8") as f:
+        questions = [line.strip() for line in f if line.strip()]
+
+    mock = MockOpenAIServer(MockConfig(
+        latency_ms=args.latency_ms,
+        token_delay_ms=args.token_delay_ms,
+        answer_tokens=args.answer_tokens,
+        tool_call_rate=args.tool_call_rate,
+    )).start()
+
+    # Settings are read at import time, so point everything at the stand-ins first
+    os.environ["OPENAI_BASE_URL"] = mock.base_url
+    os.environ["OPENAI_API_KEY"] = "mock-key"
+    os.environ["QDRANT_PATH"] = ":memory:"
+    os.environ["HISTORY_DB_PATH"] = os.path.join(tempfile.mkdtemp(prefix="loadtest-"), "history.db")
+
+    from loadtest.runner import percentile, run_load, seed_collections
+
+    try:
+        seeded = seed_collections(args.data_path, vector_size=mock.config.embedding_dim)
+        console.print(f"[dim]Seeded {seeded} chunks; mock API at {mock.base_url}[/dim]")
+
+        table = Table(title="RH team load test")
+        for column in ("Users", "Turns", "Errors", "Turns/s", "p50 turn (s)", "p99 turn (s)", "p50 TTFT (s)", "p99 TTFT (s)"):
+            table.add_column(column, justify="right")
+
+        for concurrency in args.concurrency:
+            report = asyncio.run(run_load(questions, concurrency, args.turns, stream=not args.no_stream))
+            latencies = [r.latency for r in report.succeeded]
+            ttfts = [r.ttft for r in report.succeeded if r.ttft is not None]
+            table.add_row(
+                str(concurrency),
+                str(len(report.results)),
+                str(len(report.results) - len(report.succeeded)),
+                f"{report.throughput:.2f}",
+                f"{percentile(latencies, 50):.3f}",
+                f"{percentile(latencies, 99):.3f}",
+                f"{percentile(ttfts, 50):.3f}",
+                f"{percentile(ttfts, 99):.3f}",
+            )
+
+        console.print(table)
+    finally:
+        mock.stop()
+
+
+if __name__ == "__main__":
+    main()
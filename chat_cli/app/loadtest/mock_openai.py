@@ -0,0 +1,240 @@
+# mock_openai.py
+"""
+Mock OpenAI Server
+==================
+Local stand-in for the OpenAI endpoints used by the chat pipeline:
+* `POST /v1/embeddings` – deterministic unit vectors derived from the input text
+* `POST /v1/chat/completions` – canned answers or tool calls, plain or streamed (SSE)
+
+Only the standard library is used, so the server can run anywhere the chat CLI runs.
+Latency is simulated per request (time to first token) and per streamed chunk.
+"""
+
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+from core.logger import logger
+
+_WORDS = (
+    "according to the company handbook employees should follow the documented procedure "
+    "and contact human resources when a policy does not cover their situation"
+).split()
+
+
+@dataclass
+class MockConfig:
+    """Behaviour of the mock server."""
+    latency_ms: float = 300.0          # Delay before the first byte of every response
+    token_delay_ms: float = 15.0       # Delay between streamed chunks
+    answer_tokens: int = 120           # Words in a generated answer
+    words_per_chunk: int = 3           # Words per streamed chunk
+    tool_call_rate: float = 1.0        # Probability of answering a fresh user turn with a tool call
+    embedding_dim: int = 1536
+    tool_arguments: Dict[str, Any] = field(default_factory=lambda: {"member_id": "hr-policies-specialist"})
+    seed: int = 42
+
+
+def fake_embedding(text: str, dim: int) -> List[float]:
+    """Deterministic unit vector for a text, so identical texts embed identically."""
+    seed = int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "big")
+    rng = random.Random(seed)
+    vector = [rng.gauss(0.0, 1.0) for _ in range(dim)]
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+
+def _estimate_tokens(payload: Any) -> int:
+    return max(1, len(json.dumps(payload, ensure_ascii=False)) // 4)
+
+
+class MockOpenAIHandler(BaseHTTPRequestHandler):
+    server: "MockOpenAIServer"
+
+    def log_message(self, format: str, *args) -> None:  # noqa: A002 - BaseHTTPRequestHandler signature
+        logger.debug(f"mock-openai: {format % args}")
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length", "0"))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        config = self.server.config
+        time.sleep(config.latency_ms / 1000)
+
+        if self.path.rstrip("/").endswith("/embeddings"):
+            self._send_json(self._embeddings(body))
+        elif self.path.rstrip("/").endswith("/chat/completions"):
+            self._chat_completion(body)
+        else:
+            self._send_json({"error": {"message": f"Unknown path {self.path}"}}, status=404)
+
+    # ───────────────────── Embeddings ─────────────────────
+    def _embeddings(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        inputs = body.get("input", "")
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        dim = body.get("dimensions") or self.server.config.embedding_dim
+        return {
+            "object": "list",
+            "model": body.get("model", "mock-embedding"),
+            "data": [
+                {"object": "embedding", "index": i, "embedding": fake_embedding(str(text), dim)}
+                for i, text in enumerate(inputs)
+            ],
+            "usage": {"prompt_tokens": _estimate_tokens(inputs), "total_tokens": _estimate_tokens(inputs)},
+        }
+
+    # ───────────────────── Chat completions ─────────────────────
+    def _chat_completion(self, body: Dict[str, Any]) -> None:
+        messages = body.get("messages", [])
+        tool_call = self._pick_tool_call(body.get("tools") or [], messages)
+        content = None if tool_call else self.server.answer()
+        prompt_tokens = _estimate_tokens(messages)
+        completion_tokens = len(content.split()) if content else 10
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "prompt_tokens_details": {"cached_tokens": 0},
+        }
+        base = {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "created": int(time.time()),
+            "model": body.get("model", "mock-chat"),
+        }
+
+        if not body.get("stream"):
+            message: Dict[str, Any] = {"role": "assistant", "content": content}
+            if tool_call:
+                message["tool_calls"] = [tool_call]
+            self._send_json({
+                **base,
+                "object": "chat.completion",
+                "choices": [{
+                    "index": 0,
+                    "message": message,
+                    "finish_reason": "tool_calls" if tool_call else "stop",
+                }],
+                "usage": usage,
+            })
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        chunk = {**base, "object": "chat.completion.chunk"}
+
+        if tool_call:
+            self._send_event({**chunk, "choices": [{"index": 0, "delta": {
+                "role": "assistant",
+                "tool_calls": [{**tool_call, "index": 0, "function": {"name": tool_call["function"]["name"], "arguments": ""}}],
+            }, "finish_reason": None}]})
+            self._send_event({**chunk, "choices": [{"index": 0, "delta": {
+                "tool_calls": [{"index": 0, "function": {"arguments": tool_call["function"]["arguments"]}}],
+            }, "finish_reason": None}]})
+            finish_reason = "tool_calls"
+        else:
+            words = content.split()
+            step = max(1, self.server.config.words_per_chunk)
+            for i in range(0, len(words), step):
+                delta = " ".join(words[i:i + step]) + (" " if i + step < len(words) else "")
+                delta_payload: Dict[str, Any] = {"content": delta}
+                if i == 0:
+                    delta_payload["role"] = "assistant"
+                self._send_event({**chunk, "choices": [{"index": 0, "delta": delta_payload, "finish_reason": None}]})
+                time.sleep(self.server.config.token_delay_ms / 1000)
+            finish_reason = "stop"
+
+        self._send_event({**chunk, "choices": [{"index": 0, "delta": {}, "finish_reason": finish_reason}]})
+        if (body.get("stream_options") or {}).get("include_usage"):
+            self._send_event({**chunk, "choices": [], "usage": usage})
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+    def _pick_tool_call(self, tools: List[Dict[str, Any]], messages: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Call a tool on fresh user turns; answer in text once a tool result is present."""
+        if not tools or not messages or messages[-1].get("role") != "user":
+            return None
+        if not self.server.should_call_tool():
+            return None
+
+        functions = [tool.get("function", {}) for tool in tools]
+        preferred = ("transfer_task_to_member", "search_knowledge_base")
+        function = next((f for name in preferred for f in functions if f.get("name") == name), functions[0])
+        question = str(messages[-1].get("content") or "")
+        arguments = {}
+        for name, schema in (function.get("parameters") or {}).get("properties", {}).items():
+            if name in self.server.config.tool_arguments:
+                arguments[name] = self.server.config.tool_arguments[name]
+            elif schema.get("type") == "integer":
+                arguments[name] = 1
+            elif schema.get("type") == "boolean":
+                arguments[name] = False
+            elif schema.get("type") == "array":
+                arguments[name] = []
+            elif schema.get("type") == "object":
+                arguments[name] = {}
+            else:
+                arguments[name] = question
+        return {
+            "id": f"call_{uuid.uuid4().hex[:24]}",
+            "type": "function",
+            "function": {"name": function.get("name", ""), "arguments": json.dumps(arguments)},
+        }
+
+    # ───────────────────── Transport helpers ─────────────────────
+    def _send_json(self, payload: Dict[str, Any], status: int = 200) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_event(self, payload: Dict[str, Any]) -> None:
+        self.wfile.write(f"data: {json.dumps(payload)}\n\n".encode("utf-8"))
+        self.wfile.flush()
+
+
+class MockOpenAIServer(ThreadingHTTPServer):
+    """Threaded mock server; one thread per in-flight request, like a real API."""
+
+    daemon_threads = True
+
+    def __init__(self, config: MockConfig, host: str = "127.0.0.1", port: int = 0):
+        super().__init__((host, port), MockOpenAIHandler)
+        self.config = config
+        self._rng = random.Random(config.seed)
+        self._rng_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def should_call_tool(self) -> bool:
+        with self._rng_lock:
+            return self._rng.random() < self.config.tool_call_rate
+
+    def answer(self) -> str:
+        with self._rng_lock:
+            return " ".join(self._rng.choice(_WORDS) for _ in range(self.config.answer_tokens))
+
+    def start(self) -> "MockOpenAIServer":
+        """Serve in a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, name="mock-openai", daemon=True)
+        self._thread.start()
+        logger.info(f"Mock OpenAI server listening on {self.base_url}")
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,165 @@
+# runner.py
+"""
+Load Test Runner
+================
+Replays a question set against real RH teams at a fixed concurrency:
+* Seeds the (local mode) Qdrant collections from `data/` using the configured embedder
+* Runs `concurrency` virtual users, each with its own team and conversation history
+* Reports throughput and p50/p99 latency for whole turns and time to first token
+
+Meant to run against `mock_openai.MockOpenAIServer` and `QDRANT_PATH=":memory:"`,
+so the team's scaling limits can be measured without the real API.
+"""
+
+import asyncio
+import math
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional
+
+from qdrant_client.models import Distance, PayloadSchemaType, PointStruct, VectorParams
+
+from teams.rh_team_specialist import create_rh_team, build_rh_team_message
+from history.manager import ConversationHistory
+from vectordb.qdrant_factory import get_embedder, get_qdrant_client, resolve_collection
+from core.settings import get_settings
+from core.logger import logger
+
+settings = get_settings()
+
+
+@dataclass
+class TurnResult:
+    latency: float
+    ttft: Optional[float]
+    error: Optional[str] = None
+
+
+@dataclass
+class LoadReport:
+    concurrency: int
+    wall_time: float
+    results: List[TurnResult] = field(default_factory=list)
+
+    @property
+    def succeeded(self) -> List[TurnResult]:
+        return [r for r in self.results if r.error is None]
+
+    @property
+    def throughput(self) -> float:
+        return len(self.succeeded) / self.wall_time if self.wall_time else 0.0
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile (0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def _split_chunks(text: str, chunk_size: int) -> List[str]:
+    """Paragraph-based chunking, good enough to give the retriever realistic payloads."""
+    chunks, current = [], ""
+    for paragraph in text.split("\n\n"):
+        if current and len(current) + len(paragraph) > chunk_size:
+            chunks.append(current.strip())
+            current = ""
+        current += paragraph + "\n\n"
+    if current.strip():
+        chunks.append(current.strip())
+    return chunks
+
+
+def seed_collections(data_path: str, vector_size: int, chunk_size: int = 300) -> int:
+    """Create and fill every configured collection from the markdown files in data_path."""
+    client = get_qdrant_client()
+    embedder = get_embedder()
+    total = 0
+
+    for collection_key in settings.COLLECTIONS:
+        folder = Path(data_path) / collection_key.replace("_", "-")
+        collection_name, domain = resolve_collection(collection_key)
+        if not client.collection_exists(collection_name):
+            client.create_collection(
+                collection_name=collection_name,
+                vectors_config=VectorParams(size=vector_size, distance=Distance.COSINE),
+            )
+            client.create_payload_index(collection_name, field_name="domain", field_schema=PayloadSchemaType.KEYWORD)
+
+        points = []
+        for file_path in sorted(folder.glob("*.md")):
+            doc_id = f"{folder.name}_{file_path.name}"
+            for i, chunk in enumerate(_split_chunks(file_path.read_text(encoding="utf-8"), chunk_size)):
+                points.append(PointStruct(
+                    id=str(uuid.uuid5(uuid.NAMESPACE_URL, f"{doc_id}#{i}")),
+                    vector=embedder.get_embedding(chunk),
+                    payload={
+                        "document_id": doc_id,
+                        "filepath": str(file_path),
+                        "filename": file_path.name,
+                        "chunk_index": i,
+                        "chunk_text": chunk,
+                        "domain": domain or collection_name,
+                    },
+                ))
+        if points:
+            client.upsert(collection_name=collection_name, points=points)
+        logger.info(f"Seeded {len(points)} chunks into {collection_name}")
+        total += len(points)
+
+    return total
+
+
+async def _run_turn(team, history: ConversationHistory, question: str, stream: bool) -> TurnResult:
+    message = build_rh_team_message(team, history, question)
+    start = time.perf_counter()
+    ttft = None
+    content = ""
+    try:
+        if stream:
+            response_stream = await team.arun(message, stream=True, session_id=history.session_id)
+            async for chunk in response_stream:
+                delta = getattr(chunk, "content", None)
+                if isinstance(delta, str) and delta:
+                    if ttft is None:
+                        ttft = time.perf_counter() - start
+                    content += delta
+        else:
+            response = await team.arun(message, session_id=history.session_id)
+            content = str(response.content or "")
+        latency = time.perf_counter() - start
+        if content:
+            await history.arecord(question, content)
+            await history.acompact()
+        return TurnResult(latency=latency, ttft=ttft)
+    except Exception as e:
+        logger.error(f"Load test turn failed: {str(e)}")
+        return TurnResult(latency=time.perf_counter() - start, ttft=ttft, error=str(e))
+
+
+async def run_load(questions: List[str], concurrency: int, total_turns: int, stream: bool = True) -> LoadReport:
+    """Replay questions (round robin) with `concurrency` virtual users until total_turns are done."""
+    queue: "asyncio.Queue[str]" = asyncio.Queue()
+    for i in range(total_turns):
+        queue.put_nowait(questions[i % len(questions)])
+
+    report = LoadReport(concurrency=concurrency, wall_time=0.0)
+
+    async def virtual_user() -> None:
+        team = create_rh_team()
+        history = ConversationHistory(f"loadtest-{uuid.uuid4()}")
+        while True:
+            try:
+                question = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            report.results.append(await _run_turn(team, history, question, stream))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(virtual_user() for _ in range(concurrency)))
+    report.wall_time = time.perf_counter() - start
+    return report
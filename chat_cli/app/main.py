@@ -7,20 +7,37 @@ Main entry point for the RH Team Specialist chat interface.
 
 import sys
 import os
+import threading
+import time
 
 # Add the app directory to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from agno.utils.response import create_panel
 from rich.console import Console
 from rich.prompt import Prompt
+from rich.text import Text
 
-from teams.rh_team_specialist import create_rh_team
+from teams.rh_team_specialist import create_rh_team, build_rh_team_message
+from history.manager import ConversationHistory
+from ui.stream_renderer import StreamRenderer, format_latency_footer
 from core.settings import get_settings
 from core.logger import logger
+from core.usage import token_usage
 
 console = Console()
 settings = get_settings()
 
+def show_member_responses(renderer: StreamRenderer, rh_team, shown: int) -> int:
+    """Render member runs completed since the last call; returns how many are shown."""
+    run_response = rh_team.run_response
+    member_responses = (getattr(run_response, "member_responses", None) or []) if run_response else []
+    names = {getattr(member, "agent_id", None): member.name for member in rh_team.members}
+    for response in member_responses[shown:]:
+        name = names.get(getattr(response, "agent_id", None)) or "Team Member"
+        renderer.member_response(name, str(response.content or ""))
+    return max(shown, len(member_responses))
+
 def main() -> None:
     """Main chat interface for RH Team Specialist."""
     
@@ -29,6 +46,8 @@ def main() -> None:
         
         # Create the RH team
         rh_team = create_rh_team()
+        history = ConversationHistory(settings.CHAT_SESSION_ID)
+        compaction = None
         
         # Display welcome message
         console.print("[bold green]🏢 RH Team Specialist - Multi-Agent Coordinator[/bold green]")
@@ -51,8 +70,43 @@ def main() -> None:
                 console.print("\n[dim]🤔 Analisando e consultando especialistas...[/dim]\n")
                 logger.info(f"Processing question: {question}")
                 
-                # Use print_response for better formatting and streaming
-                rh_team.print_response(question, stream=settings.ENABLE_STREAMING)
+                if compaction is not None:
+                    compaction.join()
+                message = build_rh_team_message(rh_team, history, question)
+                
+                if settings.ENABLE_STREAMING and settings.INCREMENTAL_RENDERING:
+                    # Render the streamed answer incrementally at a fixed frame rate
+                    # Member runs finish inside the coordinator's tool calls; show them as they complete
+                    with StreamRenderer(console) as renderer:
+                        shown_members = 0
+                        for chunk in rh_team.run(message, stream=True):
+                            if settings.SHOW_MEMBERS_RESPONSES:
+                                shown_members = show_member_responses(renderer, rh_team, shown_members)
+                            delta = getattr(chunk, "content", None)
+                            if isinstance(delta, str):
+                                renderer.feed(delta)
+                        if settings.SHOW_MEMBERS_RESPONSES:
+                            show_member_responses(renderer, rh_team, shown_members)
+                        renderer.usage = token_usage(rh_team.run_response)
+                    answer = renderer.text
+                else:
+                    # Use print_response for better formatting and streaming
+                    # The message carries the injected <context> block; show only the user's question
+                    console.print(create_panel(Text(question, style="green"), title="Message", border_style="cyan"))
+                    start = time.perf_counter()
+                    rh_team.print_response(message, stream=settings.ENABLE_STREAMING, show_message=False)
+                    if settings.SHOW_LATENCY_FOOTER:
+                        usage = token_usage(rh_team.run_response)
+                        console.print(format_latency_footer(None, time.perf_counter() - start, usage))
+                    answer = rh_team.run_response.content if rh_team.run_response is not None else None
+                
+                logger.info(f"Token usage: {token_usage(rh_team.run_response)}")
+                if answer:
+                    history.record(question, str(answer))
+                    if history.needs_compaction:
+                        # Summarize older turns while the user types the next question
+                        compaction = threading.Thread(target=history.compact, daemon=True)
+                        compaction.start()
                         
             except KeyboardInterrupt:
                 console.print("\n\n[dim]Interrompido pelo usuário. Até logo! 👋[/dim]")
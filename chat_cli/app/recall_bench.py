@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Recall vs Latency Benchmark
+===========================
+Sweeps Qdrant search-time settings (HNSW `ef`, exact search, quantization
+rescoring, `NUM_DOCUMENTS`) over each collection and reports recall@k against
+exact NumPy ground truth, next to search latency. The fastest setting meeting
+`--target-recall` is suggested as `QDRANT_HNSW_EF` / `QDRANT_EXACT_SEARCH`.
+
+Example:
+    python chat_cli/app/recall_bench.py --limits 4 8 --ef 8 16 32 64 --target-recall 0.98
+"""
+
+import argparse
+import os
+import sys
+
+# Add the app directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+from rich.console import Console
+from rich.table import Table
+
+from evaluation.recall import (
+    ann_bypass_reason, build_sweep, evaluate, export_collection, fastest_meeting_target, sample_queries,
+)
+from vectordb.qdrant_factory import get_embedder, get_qdrant_client, resolve_collection
+from core.settings import get_settings
+
+settings = get_settings()
+console = Console()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Measure recall@k vs latency of Qdrant search settings")
+    parser.add_argument("--collections", nargs="+", default=list(settings.COLLECTIONS), choices=list(settings.COLLECTIONS), help="Collection keys to evaluate")
+    parser.add_argument("--limits", type=int, nargs="+", default=[settings.NUM_DOCUMENTS], help="Result limits (k) to evaluate")
+    parser.add_argument("--ef", type=int, nargs="+", default=[0, 16, 32, 64, 128], help="HNSW ef values (0 = collection default)")
+    parser.add_argument("--quantization", action="store_true", help="Also sweep quantized search without rescoring")
+    parser.add_argument("--queries", type=int, default=100, help="Points sampled from the collection as queries")
+    parser.add_argument("--questions", help="File with one question per line, embedded as queries instead of sampling points")
+    parser.add_argument("--target-recall", type=float, default=0.95, help="Recall@k the suggested setting must reach")
+    parser.add_argument("--warmup", type=int, default=5, help="Untimed queries per configuration")
+    parser.add_argument("--seed", type=int, default=0, help="Query sampling seed")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    client = get_qdrant_client()
+
+    question_vectors = None
+    if args.questions:
+        with open(args.questions, encoding="utf-8") as f:
+            questions = [line.strip() for line in f if line.strip()]
+        embedder = get_embedder()
+        question_vectors = np.asarray([embedder.get_embedding(q) for q in questions], dtype=np.float32)
+
+    configs = build_sweep(args.limits, args.ef, quantization=args.quantization)
+
+    for collection_key in args.collections:
+        collection, domain = resolve_collection(collection_key)
+        export = export_collection(client, collection, domain)
+        if not len(export):
+            console.print(f"[yellow]Skipping {collection_key}: no points in {collection}[/yellow]")
+            continue
+
+        if question_vectors is not None:
+            queries, exclude = question_vectors, None
+        else:
+            rows = sample_queries(export, args.queries, args.seed)
+            queries, exclude = export.vectors[rows], rows
+
+        results = evaluate(client, export, queries, configs, exclude=exclude, domain=domain, warmup=args.warmup)
+
+        table = Table(title=f"{collection_key}: {len(export)} points, {len(queries)} queries")
+        for column in ("k", "Setting", "Recall@k", "p50 (ms)", "p95 (ms)", "QPS"):
+            table.add_column(column, justify="right")
+        for result in results:
+            style = "green" if result.recall >= args.target_recall else None
+            table.add_row(
+                str(result.config.limit),
+                result.config.label,
+                f"{result.recall:.3f}",
+                f"{result.p50 * 1000:.2f}",
+                f"{result.p95 * 1000:.2f}",
+                f"{result.qps:.0f}",
+                style=style,
+            )
+        console.print(table)
+
+        bypass = ann_bypass_reason(client, export, domain)
+        if bypass:
+            console.print(
+                f"[yellow]Note: {bypass}; the ef settings above measure the same exact search "
+                "and differ only by noise.[/yellow]"
+            )
+
+        for limit in args.limits:
+            best = fastest_meeting_target(results, args.target_recall, limit)
+            if best is None:
+                console.print(f"[red]k={limit}: no setting reaches recall {args.target_recall}[/red]")
+            elif best.config.exact:
+                console.print(f"[bold]k={limit}:[/bold] fastest at recall ≥ {args.target_recall} is exact search (QDRANT_EXACT_SEARCH=true)")
+            else:
+                env = f"QDRANT_HNSW_EF={best.config.hnsw_ef or 0}"
+                if not best.config.rescore:
+                    env += ", QDRANT_QUANTIZATION_RESCORE=false"
+                console.print(
+                    f"[bold]k={limit}:[/bold] fastest at recall ≥ {args.target_recall} is {best.config.label} "
+                    f"({env}, recall {best.recall:.3f}, p50 {best.p50 * 1000:.2f} ms)"
+                )
+
+
+if __name__ == "__main__":
+    main()
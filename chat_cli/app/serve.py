@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Chat API Server
+===============
+Entry point for the RH Team Specialist HTTP service.
+"""
+
+import sys
+import os
+
+# Add the app directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import uvicorn
+
+from api.server import create_app
+from core.settings import get_settings
+from core.logger import logger
+
+settings = get_settings()
+
+def main() -> None:
+    """Run the RH Team Specialist API in a single asyncio process."""
+    logger.info(f"Starting Chat API on {settings.API_HOST}:{settings.API_PORT}")
+    uvicorn.run(
+        create_app(),
+        host=settings.API_HOST,
+        port=settings.API_PORT,
+        log_level="debug" if settings.DEBUG_MODE else "info",
+    )
+
+if __name__ == "__main__":
+    main()
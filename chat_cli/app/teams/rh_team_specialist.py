@@ -8,15 +8,24 @@ Coordinates between specialized agents:
 * Product Manual Agent
 
 Uses Agno Team coordinate mode for intelligent query routing.
+
+System prompts are kept fully static (no datetime, history or references), so
+provider-side prompt-prefix caching can reuse them across turns and sessions.
+Volatile content is sent after that prefix, in the user message built by
+`build_rh_team_message`.
 """
 
-from agno.agent import Agent
+from datetime import datetime, timezone
+
+from agno.agent import Agent, AgentKnowledge
 from agno.models.openai import OpenAIChat
 from agno.team import Team
 
 from agents.hr_policies_agent import create_hr_policies_agent
 from agents.labor_rules_agent import create_labor_rules_agent
 from agents.product_manual_agent import create_product_manual_agent
+from history.manager import ConversationHistory
+from vectordb.qdrant_factory import create_cross_domain_vector_db
 from core.settings import get_settings
 from core.logger import logger
 
@@ -31,17 +40,30 @@ def create_rh_team() -> Team:
     hr_specialist = create_hr_policies_agent()
     hr_specialist.name = "HR Policies Specialist"
     hr_specialist.role = "Specialist in company HR policies, procedures, and employee guidelines. Handles questions about company policies, employee benefits, procedures, and HR-related matters."
-    hr_specialist.add_datetime_to_instructions = True
+    hr_specialist.add_datetime_to_instructions = False  # Keep the system prompt cacheable
+    # Members get the current datetime per turn in their user message (see build_rh_team_message)
+    hr_specialist.add_context = True
     
     labor_specialist = create_labor_rules_agent()
     labor_specialist.name = "Labor Rules Specialist"
     labor_specialist.role = "Expert in labor laws, employment regulations, and workplace compliance requirements. Handles questions about worker rights, employer obligations, legal compliance, and employment law."
-    labor_specialist.add_datetime_to_instructions = True
+    labor_specialist.add_datetime_to_instructions = False
+    labor_specialist.add_context = True
     
     product_specialist = create_product_manual_agent()
     product_specialist.name = "Product Manual Specialist"
     product_specialist.role = "Expert in product documentation, technical manuals, and user guides. Handles questions about product features, installation, troubleshooting, and technical specifications."
-    product_specialist.add_datetime_to_instructions = True
+    product_specialist.add_datetime_to_instructions = False
+    product_specialist.add_context = True
+
+    # In the consolidated layout one search covers every domain, so the coordinator can
+    # answer a cross-domain question itself instead of consulting each specialist
+    team_knowledge = None
+    if settings.COLLECTION_LAYOUT == "consolidated":
+        team_knowledge = AgentKnowledge(
+            vector_db=create_cross_domain_vector_db(),
+            num_documents=settings.NUM_DOCUMENTS * len(settings.COLLECTIONS),
+        )
 
     # Create the coordinating team with enhanced settings
     rh_team = Team(
@@ -49,6 +71,8 @@ def create_rh_team() -> Team:
         mode="coordinate",
         model=OpenAIChat(settings.CHAT_MODEL_ID),
         members=[hr_specialist, labor_specialist, product_specialist],
+        knowledge=team_knowledge,
+        search_knowledge=team_knowledge is not None,
         description="You are a senior coordinator for specialized company assistance, managing expert consultations across HR policies, labor law, and product documentation.",
         instructions=[
             "You coordinate between three specialized experts to provide comprehensive company assistance.",
@@ -64,6 +88,10 @@ def create_rh_team() -> Team:
             "3. If multiple specialists are relevant, coordinate their responses for a comprehensive answer",
             "4. For questions completely outside these three domains (weather, sports, general knowledge, etc.), politely decline and redirect",
             "5. Always maintain context between interactions to provide consistent, informed assistance",
+            "6. Use the <context> block of the user message (current date, conversation summary, recent turns) to resolve references to earlier turns; specialists receive the current date automatically",
+            *([
+                "7. For questions spanning several of these domains, call `search_knowledge_base` once and answer from its references (each carries its `domain`) instead of consulting every specialist; consult a specialist only when one domain needs deeper treatment",
+            ] if team_knowledge is not None else []),
             "",
             "**For out-of-scope questions:**",
             "Explain that your team specializes exclusively in:",
@@ -79,15 +107,48 @@ def create_rh_team() -> Team:
             "- Maintain professional, helpful tone",
             "- Ensure responses are comprehensive yet clear",
         ],
-        add_datetime_to_instructions=True,
+        add_datetime_to_instructions=False,  # Datetime goes in the user message, after the cached prefix
         add_member_tools_to_system_message=False,  # Better tool call consistency
         enable_agentic_context=True,  # Maintain shared context between specialists
-        share_member_interactions=True,  # Share responses between members for better coordination
+        share_member_interactions=True,  # Share responses between members within a turn (reset per turn)
         show_members_responses=settings.SHOW_MEMBERS_RESPONSES,
-        add_history_to_messages=True,
-        num_history_runs=settings.NUM_HISTORY_RUNS,  # Remember last interactions
+        add_history_to_messages=False,  # Bounded history is injected by ConversationHistory
         markdown=True,
     )
     
     logger.info("RH Team Specialist created successfully")
-    return rh_team 
\ No newline at end of file
+    return rh_team
+
+
+def reset_member_interactions(rh_team: Team, session_id: str) -> None:
+    """Forget the member interactions Agno shared during earlier turns.
+
+    Agno prepends every past member task and response to each new member task and
+    never trims them; earlier turns already reach the coordinator through the
+    bounded ConversationHistory, so only the current turn's interactions are kept.
+    """
+    team_context = getattr(rh_team.memory, "team_context", None)
+    if isinstance(team_context, dict):
+        team_context = team_context.get(session_id)
+    if team_context is not None:
+        team_context.member_interactions.clear()
+
+
+def build_rh_team_message(rh_team: Team, history: ConversationHistory, question: str) -> str:
+    """Bind the team to the session and return the user message for this turn.
+
+    The current datetime and the session's compacted history are placed in a
+    <context> block ahead of the question, i.e. after the static system prompt.
+    Members get the same datetime in the <context> Agno appends to their user message.
+    """
+    rh_team.session_id = history.session_id
+    reset_member_interactions(rh_team, history.session_id)
+    now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
+    for member in rh_team.members:
+        member.context = {"current_datetime": now}
+    parts = [f"<current_datetime>{now}</current_datetime>"]
+    history_context = history.render()
+    if history_context:
+        parts.append(history_context)
+    context = "\n".join(parts)
+    return f"<context>\n{context}\n</context>\n\n{question}"
@@ -0,0 +1,3 @@
+"""
+Terminal rendering for Chat CLI
+"""
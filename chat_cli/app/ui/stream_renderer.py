@@ -0,0 +1,112 @@
+# stream_renderer.py
+"""
+Incremental Streaming Renderer
+==============================
+Renders a streamed markdown answer without re-rendering the whole text per chunk:
+* Completed blocks (text before the last blank line outside a code fence) are
+  printed once and never touched again
+* Only the trailing, still-growing block is redrawn, at most `STREAM_RENDER_FPS`
+  times per second
+* Specialist (member) responses are printed as panels above the streamed answer
+  as soon as each member run completes, like Agno's `print_response`
+* An optional footer reports time to first token, total turn latency and,
+  when known, prompt tokens served from the provider's prompt cache
+
+Rendering cost per frame is bounded by the size of the last block instead of the
+whole answer, so long answers no longer stutter.
+"""
+
+import time
+from typing import Optional
+
+from rich.console import Console
+from rich.live import Live
+from rich.markdown import Markdown
+from rich.panel import Panel
+
+from core.settings import get_settings
+from core.usage import TokenUsage
+
+settings = get_settings()
+
+
+def format_latency_footer(ttft: Optional[float], total: float, usage: Optional[TokenUsage] = None) -> str:
+    """Footer line with perceived latency (and prompt cache usage) for a turn."""
+    first_token = f"{ttft:.2f}s" if ttft is not None else "n/a"
+    footer = f"⏱  first token {first_token} · total {total:.2f}s"
+    if usage is not None and usage.prompt_tokens:
+        footer += f" · {usage}"
+    return f"[dim]{footer}[/dim]"
+
+
+def _block_boundary(text: str) -> int:
+    """Index just after the last blank line that is not inside a code fence, or -1."""
+    index = text.rfind("\n\n")
+    while index != -1 and text.count("```", 0, index) % 2 == 1:
+        index = text.rfind("\n\n", 0, index)
+    return index + 2 if index != -1 else -1
+
+
+class StreamRenderer:
+    """Context manager that renders streamed markdown incrementally at a fixed frame rate."""
+
+    def __init__(
+        self,
+        console: Console,
+        fps: Optional[int] = None,
+        show_footer: Optional[bool] = None,
+    ):
+        self.console = console
+        self.frame_interval = 1.0 / max(1, fps or settings.STREAM_RENDER_FPS)
+        self.show_footer = settings.SHOW_LATENCY_FOOTER if show_footer is None else show_footer
+        self.text = ""
+        self.ttft: Optional[float] = None
+        self.total: Optional[float] = None
+        self.usage: Optional[TokenUsage] = None
+        self._tail = ""
+        self._start = 0.0
+        self._last_frame = 0.0
+        self._live: Optional[Live] = None
+
+    def __enter__(self) -> "StreamRenderer":
+        self._start = time.perf_counter()
+        self._live = Live(console=self.console, auto_refresh=False, transient=True)
+        self._live.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self._live.__exit__(exc_type, exc_val, exc_tb)
+        if self._tail.strip():
+            self.console.print(Markdown(self._tail))
+        self._tail = ""
+        self.total = time.perf_counter() - self._start
+        if self.show_footer and exc_type is None:
+            self.console.print(format_latency_footer(self.ttft, self.total, self.usage))
+
+    def member_response(self, name: str, content: str) -> None:
+        """Print a completed member response as a panel above the live region."""
+        if content.strip():
+            self._live.console.print(Panel(Markdown(content), title=f"{name} Response", border_style="magenta"))
+
+    def feed(self, delta: str) -> None:
+        """Append a streamed chunk and redraw if a frame is due."""
+        if not delta:
+            return
+        now = time.perf_counter()
+        if self.ttft is None:
+            self.ttft = now - self._start
+
+        self.text += delta
+        self._tail += delta
+
+        # Print completed blocks permanently above the live region
+        boundary = _block_boundary(self._tail)
+        if boundary > 0:
+            completed, self._tail = self._tail[:boundary], self._tail[boundary:]
+            if completed.strip():
+                self._live.console.print(Markdown(completed))
+            self._live.update(Markdown(self._tail), refresh=True)
+            self._last_frame = now
+        elif now - self._last_frame >= self.frame_interval:
+            self._live.update(Markdown(self._tail), refresh=True)
+            self._last_frame = now
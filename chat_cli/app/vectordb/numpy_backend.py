@@ -0,0 +1,179 @@
+# numpy_backend.py
+"""
+In-Process NumPy Vector Backend
+===============================
+Serves small collections without a round trip to the Qdrant service:
+* On first search, the collection is exported once per process (vectors and payloads)
+  and written to `NUMPY_BACKEND_CACHE_DIR` as a float32 `.npy` matrix plus a JSON file
+* The matrix is memory-mapped back, so every agent and API session shares the same pages
+* Top-k is a vectorized dot product over L2-normalized rows (Qdrant's cosine similarity),
+  with `argpartition` to avoid sorting the whole collection
+* `domain` and dict filters become boolean masks over the payloads; Qdrant `Filter`
+  objects are still sent to Qdrant
+
+When Qdrant is unreachable at startup, the last cached export is served as is.
+"""
+
+import json
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from qdrant_client import QdrantClient
+from qdrant_client.http.models import Filter
+
+from evaluation.recall import export_collection
+from vectordb.qdrant_factory import AgnoDoc, PatchedQdrant
+from core.settings import get_settings
+from core.logger import logger
+
+settings = get_settings()
+
+# Loaded collections, shared by every NumpyQdrant searching the same collection
+_indexes_lock = threading.Lock()
+_indexes: Dict[str, "NumpyIndex"] = {}
+
+
+@dataclass
+class NumpyIndex:
+    collection: str
+    ids: List[str]
+    vectors: np.ndarray
+    payloads: List[Dict[str, Any]]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def mask(self, conditions: Dict[str, List[Any]]) -> np.ndarray:
+        """Rows whose payload value is one of the allowed values for every key."""
+        return np.fromiter(
+            (all(payload.get(key) in allowed for key, allowed in conditions.items()) for payload in self.payloads),
+            dtype=bool,
+            count=len(self),
+        )
+
+    def top_k(self, query: np.ndarray, limit: int, mask: Optional[np.ndarray] = None) -> List[Tuple[int, float]]:
+        """(row, cosine similarity) of the `limit` best rows, best first."""
+        candidates = len(self) if mask is None else int(mask.sum())
+        k = min(limit, candidates)
+        if k <= 0:
+            return []
+
+        norm = np.linalg.norm(query)
+        scores = self.vectors @ (query / norm if norm else query)
+        if mask is not None:
+            scores = np.where(mask, scores, -np.inf)
+
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(row), float(scores[row])) for row in top]
+
+
+def _cache_paths(cache_dir: str, collection: str) -> Tuple[Path, Path]:
+    directory = Path(cache_dir)
+    return directory / f"{collection}.npy", directory / f"{collection}.json"
+
+
+def has_cached_export(collection: str, cache_dir: Optional[str] = None) -> bool:
+    """Whether an earlier process left an export of the collection in the cache."""
+    vectors_path, meta_path = _cache_paths(cache_dir or settings.NUMPY_BACKEND_CACHE_DIR, collection)
+    return vectors_path.exists() and meta_path.exists()
+
+
+def _write_cache(cache_dir: str, collection: str, ids: List[str], vectors: np.ndarray, payloads: List[dict]) -> None:
+    """Write the export atomically, so concurrent processes never map a partial file."""
+    vectors_path, meta_path = _cache_paths(cache_dir, collection)
+    vectors_path.parent.mkdir(parents=True, exist_ok=True)
+
+    tmp_vectors = vectors_path.with_suffix(f".{os.getpid()}.tmp.npy")
+    tmp_meta = meta_path.with_suffix(f".{os.getpid()}.tmp")
+    np.save(tmp_vectors, np.ascontiguousarray(vectors, dtype=np.float32))
+    tmp_meta.write_text(json.dumps({"ids": ids, "payloads": payloads}), encoding="utf-8")
+    os.replace(tmp_vectors, vectors_path)
+    os.replace(tmp_meta, meta_path)
+
+
+def load_index(client: QdrantClient, collection: str, cache_dir: Optional[str] = None) -> NumpyIndex:
+    """Return the in-process index of a collection, exporting it from Qdrant on first use."""
+    cache_dir = cache_dir or settings.NUMPY_BACKEND_CACHE_DIR
+    with _indexes_lock:
+        if collection in _indexes:
+            return _indexes[collection]
+
+        vectors_path, meta_path = _cache_paths(cache_dir, collection)
+        try:
+            export = export_collection(client, collection)
+            _write_cache(cache_dir, collection, export.ids, export.vectors, export.payloads)
+            logger.info(f"Exported {len(export)} points of {collection} to {vectors_path}")
+        except Exception as e:
+            if not has_cached_export(collection, cache_dir):
+                raise
+            logger.warning(f"Could not export {collection} from Qdrant ({e}); serving the cached export")
+
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        index = NumpyIndex(
+            collection=collection,
+            ids=meta["ids"],
+            vectors=np.load(vectors_path, mmap_mode="r"),
+            payloads=meta["payloads"],
+        )
+        _indexes[collection] = index
+        return index
+
+
+class NumpyQdrant(PatchedQdrant):
+    """PatchedQdrant that answers searches in process from a memory-mapped export of the collection."""
+
+    def __init__(
+        self,
+        collection: str,
+        default_snippet_name: str,
+        client: Optional[QdrantClient] = None,
+        domains: Optional[List[str]] = None,
+        cache_dir: Optional[str] = None,
+        **kwargs,
+    ):
+        super().__init__(
+            collection=collection,
+            default_snippet_name=default_snippet_name,
+            client=client,
+            domains=domains,
+            **kwargs,
+        )
+        self.cache_dir = cache_dir
+        self._index: Optional[NumpyIndex] = None
+        self._domain_mask: Optional[np.ndarray] = None
+
+    @property
+    def index(self) -> NumpyIndex:
+        if self._index is None:
+            index = load_index(self.client, self.collection, self.cache_dir)
+            self._domain_mask = index.mask({"domain": self.domains}) if self.domains else None
+            self._index = index
+        return self._index
+
+    def search(  # type: ignore[override]
+        self,
+        query: str,
+        limit: int = 4,
+        filters: Optional[Filter] = None,
+        **kwargs,
+    ) -> List[AgnoDoc]:
+        # Qdrant Filter objects can express more than payload equality; let Qdrant evaluate them
+        if filters is not None and not isinstance(filters, dict):
+            return super().search(query, limit, filters, **kwargs)
+
+        index = self.index
+        mask = self._domain_mask
+        if filters:
+            filter_mask = index.mask({key: [value] for key, value in filters.items()})
+            mask = filter_mask if mask is None else mask & filter_mask
+
+        query_vector = np.asarray(self.embedder.get_embedding(query), dtype=np.float32)
+        return [
+            self._to_doc(index.ids[row], index.payloads[row], score)
+            for row, score in index.top_k(query_vector, limit, mask)
+        ]
@@ -7,17 +7,30 @@ across all agents. This factory provides a consistent interface for vector datab
 operations with OpenAI embeddings.
 """
 
+import asyncio
+import threading
 from dataclasses import dataclass, asdict
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Type
 
-from qdrant_client.http.models import Filter
+from qdrant_client import QdrantClient
+from qdrant_client.http.models import (
+    FieldCondition, Filter, MatchAny, MatchValue, QuantizationSearchParams, SearchParams,
+)
 from agno.vectordb.qdrant import Qdrant as AgnoQdrant
 from agno.embedder.openai import OpenAIEmbedder
 
 from core.settings import get_settings
+from core.logger import logger
 
 settings = get_settings()
 
+# Shared connection objects, created once per process and reused by every agent
+_shared_lock = threading.Lock()
+_shared_client: Optional[QdrantClient] = None
+_shared_embedder: Optional[OpenAIEmbedder] = None
+_vector_dbs: Dict[str, "PatchedQdrant"] = {}
+CROSS_DOMAIN_KEY = "__cross_domain__"
+
 # ───────────────────── Document compatível ─────────────────────
 @dataclass
 class AgnoDoc:
@@ -36,18 +49,31 @@ class AgnoDoc:
 class PatchedQdrant(AgnoQdrant):
     """Override search to preencher `name` e devolver `AgnoDoc`s."""
 
-    def __init__(self, collection: str, default_snippet_name: str, **kwargs):
+    def __init__(
+        self,
+        collection: str,
+        default_snippet_name: str,
+        client: Optional[QdrantClient] = None,
+        domains: Optional[List[str]] = None,
+        **kwargs,
+    ):
         """Initialize PatchedQdrant with collection-specific default snippet name.
         
         Args:
             collection: The Qdrant collection name
             default_snippet_name: Default name for snippets when no name is found in metadata (required)
+            client: Optional QdrantClient to reuse instead of opening a new connection
+            domains: Restrict searches to points whose `domain` payload is one of these
+                (consolidated layout); None searches the whole collection
             **kwargs: Additional arguments passed to parent class
         """
         if not default_snippet_name:
             raise ValueError("default_snippet_name is required and cannot be empty")
         super().__init__(collection=collection, **kwargs)
         self.default_snippet_name = default_snippet_name
+        self.domains = domains
+        if client is not None:
+            self._client = client
 
     def search(  # type: ignore[override]
         self,
@@ -59,50 +85,141 @@ class PatchedQdrant(AgnoQdrant):
         query_vector = self.embedder.get_embedding(query)
         kwargs.pop("filters", None)
         kwargs.pop("filter", None)
+        kwargs.setdefault("search_params", default_search_params())
 
         results = self.client.search(
             collection_name=self.collection,
             query_vector=query_vector,
             limit=limit,
-            query_filter=filters,
+            query_filter=self._with_domain_filter(filters),
             **kwargs,
         )
 
-        docs: List[AgnoDoc] = []
-        for r in results:
-            payload: Dict[str, Any] = r.payload or {}
-            # Use chunk_text as the main text content
-            text = payload.get("chunk_text") or payload.get("text", "")
-            
-            # Create a meaningful name from filename and chunk_index if available
-            filename = payload.get("filename", "")
-            chunk_index = payload.get("chunk_index")
+        return [self._to_doc(r.id, r.payload, r.score) for r in results]
+
+    def _to_doc(self, point_id: Any, payload: Optional[Dict[str, Any]], score: Optional[float]) -> AgnoDoc:
+        """Build an AgnoDoc from a point's payload."""
+        payload = payload or {}
+        # Use chunk_text as the main text content
+        text = payload.get("chunk_text") or payload.get("text", "")
+        
+        # Create a meaningful name from filename and chunk_index if available
+        filename = payload.get("filename", "")
+        chunk_index = payload.get("chunk_index")
+        
+        if filename and chunk_index is not None:
+            name = f"{filename}_chunk_{chunk_index}"
+        elif filename:
+            name = filename
+        elif payload.get("name"):
+            name = payload.get("name")
+        elif text:
+            name = text[:40].strip()
+        else:
+            name = self.default_snippet_name
             
-            if filename and chunk_index is not None:
-                name = f"{filename}_chunk_{chunk_index}"
-            elif filename:
-                name = filename
-            elif payload.get("name"):
-                name = payload.get("name")
-            elif text:
-                name = text[:40].strip()
+        return AgnoDoc(
+            id=str(point_id),
+            text=text,
+            metadata=payload,
+            score=score or 0.0,
+            name=name,
+        )
+
+    def _with_domain_filter(self, filters: Optional[Any]) -> Optional[Filter]:
+        """Combine caller filters (Filter or {key: value} dict) with the domain restriction."""
+        if isinstance(filters, dict):
+            filters = Filter(must=[FieldCondition(key=k, match=MatchValue(value=v)) for k, v in filters.items()])
+        if not self.domains:
+            return filters
+
+        domain_condition = FieldCondition(key="domain", match=MatchAny(any=self.domains))
+        if filters is None:
+            return Filter(must=[domain_condition])
+
+        must = filters.must if isinstance(filters.must, list) else [filters.must] if filters.must else []
+        return Filter(must=[*must, domain_condition], should=filters.should, must_not=filters.must_not)
+
+    async def async_search(  # type: ignore[override]
+        self,
+        query: str,
+        limit: int = 4,
+        filters: Optional[Filter] = None,
+        **kwargs,
+    ) -> List[AgnoDoc]:
+        """Run the patched search off the event loop, reusing the shared sync client."""
+        return await asyncio.to_thread(self.search, query, limit, filters, **kwargs)
+
+
+def default_search_params() -> Optional[SearchParams]:
+    """Search-time parameters from settings, or None to use the collection defaults."""
+    if not settings.QDRANT_HNSW_EF and not settings.QDRANT_EXACT_SEARCH and settings.QDRANT_QUANTIZATION_RESCORE:
+        return None
+    return SearchParams(
+        hnsw_ef=settings.QDRANT_HNSW_EF or None,
+        exact=settings.QDRANT_EXACT_SEARCH,
+        quantization=QuantizationSearchParams(rescore=settings.QDRANT_QUANTIZATION_RESCORE),
+    )
+
+
+def get_qdrant_client() -> QdrantClient:
+    """Return the process-wide QdrantClient, creating it on first use."""
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is None:
+            if settings.QDRANT_PATH == ":memory:":
+                _shared_client = QdrantClient(location=":memory:")
+            elif settings.QDRANT_PATH:
+                _shared_client = QdrantClient(path=settings.QDRANT_PATH)
             else:
-                name = self.default_snippet_name
-                
-            docs.append(
-                AgnoDoc(
-                    id=str(r.id),
-                    text=text,
-                    metadata=payload,
-                    score=r.score or 0.0,
-                    name=name,
-                )
-            )
-        return docs
+                _shared_client = QdrantClient(url=settings.QDRANT_URL)
+        return _shared_client
+
+
+def get_embedder() -> OpenAIEmbedder:
+    """Return the process-wide OpenAI embedder, creating it on first use."""
+    global _shared_embedder
+    with _shared_lock:
+        if _shared_embedder is None:
+            _shared_embedder = OpenAIEmbedder()
+        return _shared_embedder
+
+
+def resolve_collection(collection_key: str) -> Tuple[str, Optional[str]]:
+    """Return the Qdrant collection and domain filter for a key under the configured layout."""
+    domain = settings.COLLECTIONS[collection_key]
+    if settings.COLLECTION_LAYOUT == "consolidated":
+        return settings.CONSOLIDATED_COLLECTION, domain
+    return domain, None
+
+
+def select_backend(collection: str) -> Type[PatchedQdrant]:
+    """PatchedQdrant subclass serving a collection under the configured VECTOR_BACKEND."""
+    backend = settings.VECTOR_BACKEND
+    if backend == "auto":
+        try:
+            points = get_qdrant_client().count(collection_name=collection, exact=True).count
+            backend = "numpy" if points <= settings.NUMPY_BACKEND_MAX_POINTS else "qdrant"
+        except Exception as e:
+            # Qdrant is unreachable: the last cached export keeps the chat working
+            from vectordb.numpy_backend import has_cached_export
+            backend = "numpy" if has_cached_export(collection) else "qdrant"
+            logger.warning(f"Could not count points of {collection} ({e}); using the {backend} backend")
+
+    if backend == "numpy":
+        # Imported lazily: the NumPy backend builds on PatchedQdrant from this module
+        from vectordb.numpy_backend import NumpyQdrant
+        return NumpyQdrant
+    return PatchedQdrant
 
 
 def create_vector_db(collection_key: str) -> PatchedQdrant:
     """Factory function to create a PatchedQdrant instance for a specific collection.
+
+    Instances are cached per collection key, so every agent (and every API session)
+    searching the same collection shares one vector database, embedder and Qdrant client.
+    With VECTOR_BACKEND=numpy (or auto, for small collections) searches are answered
+    in process by NumpyQdrant instead of the Qdrant service.
     
     Args:
         collection_key: Key from settings.COLLECTIONS (e.g., 'hr_policies', 'labor_rules', 'product_manual')
@@ -120,6 +237,9 @@ def create_vector_db(collection_key: str) -> PatchedQdrant:
     if collection_key not in settings.COLLECTIONS:
         raise KeyError(f"Collection key '{collection_key}' not found in settings.COLLECTIONS")
     
+    if collection_key in _vector_dbs:
+        return _vector_dbs[collection_key]
+    
     # Collection-specific default snippet names
     snippet_names = {
         "hr_policies": "hr_policy_snippet",
@@ -127,15 +247,48 @@ def create_vector_db(collection_key: str) -> PatchedQdrant:
         "product_manual": "product_manual_snippet"
     }
     
-    # Use OpenAI embedder
-    embedder = OpenAIEmbedder()
+    # In the consolidated layout every specialist searches the same collection with a domain filter
+    collection, domain = resolve_collection(collection_key)
     
-    # Create PatchedQdrant instance
-    vector_db = PatchedQdrant(
-        collection=settings.COLLECTIONS[collection_key],
+    # Create the vector database on top of the shared embedder and client
+    vector_db = select_backend(collection)(
+        collection=collection,
         url=settings.QDRANT_URL,
-        embedder=embedder,
+        embedder=get_embedder(),
+        client=get_qdrant_client(),
+        domains=[domain] if domain else None,
         default_snippet_name=snippet_names.get(collection_key, "document_snippet")
     )
     
-    return vector_db
\ No newline at end of file
+    with _shared_lock:
+        return _vector_dbs.setdefault(collection_key, vector_db)
+
+
+def create_cross_domain_vector_db() -> PatchedQdrant:
+    """Create a PatchedQdrant that searches every domain with a single query.
+
+    Only available in the consolidated layout, where all domains share one collection.
+    Used as the RH team coordinator's knowledge base; the instance is cached like
+    those of create_vector_db.
+
+    Raises:
+        RuntimeError: If COLLECTION_LAYOUT is not 'consolidated' or OpenAI API key is not set
+    """
+    if settings.COLLECTION_LAYOUT != "consolidated":
+        raise RuntimeError("Cross-domain search requires COLLECTION_LAYOUT=consolidated")
+    if not settings.OPENAI_API_KEY:
+        raise RuntimeError("Please set OPENAI_API_KEY environment variable")
+
+    if CROSS_DOMAIN_KEY in _vector_dbs:
+        return _vector_dbs[CROSS_DOMAIN_KEY]
+
+    vector_db = select_backend(settings.CONSOLIDATED_COLLECTION)(
+        collection=settings.CONSOLIDATED_COLLECTION,
+        url=settings.QDRANT_URL,
+        embedder=get_embedder(),
+        client=get_qdrant_client(),
+        default_snippet_name="document_snippet",
+    )
+
+    with _shared_lock:
+        return _vector_dbs.setdefault(CROSS_DOMAIN_KEY, vector_db)
@@ -0,0 +1,16 @@
+import os
+import sys
+
+import pytest
+
+# Application modules import each other as top-level packages (core, api, history, ...)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
+
+from history.store import SessionStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SessionStore(str(tmp_path / "history.db"))
+    yield store
+    store.close()
@@ -0,0 +1,144 @@
+import pytest
+
+from history.manager import ConversationHistory, estimate_tokens
+
+
+class StubSummarizer:
+    """Summarizer stand-in that appends the folded questions to the summary"""
+
+    def __init__(self, fail=False):
+        self.calls = []
+        self.fail = fail
+
+    def __call__(self, summary, turns, max_tokens):
+        self.calls.append([turn.question for turn in turns])
+        if self.fail:
+            raise RuntimeError("model unavailable")
+        return " ".join([summary, *(turn.question for turn in turns)]).strip()
+
+
+def history(store, summarizer, max_recent_turns=2, budget=500, session_id="s"):
+    return ConversationHistory(
+        session_id,
+        store=store,
+        max_recent_turns=max_recent_turns,
+        summary_token_budget=budget,
+        summarizer=summarizer,
+    )
+
+
+def chat(conversation, questions):
+    for question in questions:
+        conversation.record(question, f"answer to {question}")
+        conversation.compact()
+
+
+def test_turns_are_kept_verbatim_until_twice_the_limit(store):
+    summarizer = StubSummarizer()
+    conversation = history(store, summarizer)
+    chat(conversation, ["q1", "q2", "q3"])
+
+    assert summarizer.calls == []
+    assert [turn.question for turn in conversation.turns] == ["q1", "q2", "q3"]
+    assert conversation.summary == ""
+
+
+def test_compaction_folds_a_batch_of_turns(store):
+    summarizer = StubSummarizer()
+    conversation = history(store, summarizer)
+    chat(conversation, [f"q{i}" for i in range(1, 13)])
+
+    # One summarizer call every max_recent_turns turns, not one per turn
+    assert summarizer.calls == [["q1", "q2"], ["q3", "q4"], ["q5", "q6"], ["q7", "q8"], ["q9", "q10"]]
+    assert [turn.question for turn in conversation.turns] == ["q11", "q12"]
+    assert conversation.summary == "q1 q2 q3 q4 q5 q6 q7 q8 q9 q10"
+
+
+def test_record_does_not_compact(store):
+    summarizer = StubSummarizer()
+    conversation = history(store, summarizer, max_recent_turns=1)
+    conversation.record("q1", "a1")
+    conversation.record("q2", "a2")
+
+    assert conversation.needs_compaction
+    assert summarizer.calls == []
+
+
+def test_without_verbatim_turns_every_turn_is_folded(store):
+    summarizer = StubSummarizer()
+    conversation = history(store, summarizer, max_recent_turns=0)
+    chat(conversation, ["q1", "q2"])
+
+    assert summarizer.calls == [["q1"], ["q2"]]
+    assert conversation.turns == []
+
+
+def test_render_includes_summary_and_recent_turns(store):
+    conversation = history(store, StubSummarizer())
+    assert conversation.render() is None
+
+    chat(conversation, ["q1", "q2", "q3", "q4", "q5"])
+    rendered = conversation.render()
+
+    assert "<conversation_summary>\nq1 q2\n</conversation_summary>" in rendered
+    assert "User: q3\nAssistant: answer to q3" in rendered
+    assert "User: q5\nAssistant: answer to q5" in rendered
+    assert "q2\nAssistant" not in rendered
+
+
+def test_session_resumes_from_the_store(store):
+    chat(history(store, StubSummarizer()), ["q1", "q2", "q3", "q4", "q5"])
+
+    resumed = history(store, StubSummarizer())
+    assert resumed.summary == "q1 q2"
+    assert [turn.question for turn in resumed.turns] == ["q3", "q4", "q5"]
+    assert history(store, StubSummarizer(), session_id="other").render() is None
+
+
+def test_registered_session_resumes_before_its_first_turn(store):
+    store.register("s")
+
+    assert store.exists("s")
+    assert history(store, StubSummarizer()).render() is None
+
+
+def test_failed_compaction_keeps_turns_and_retries(store):
+    summarizer = StubSummarizer(fail=True)
+    conversation = history(store, summarizer)
+    chat(conversation, ["q1", "q2", "q3", "q4"])
+
+    assert len(conversation.turns) == 4
+    assert len(history(store, StubSummarizer()).turns) == 4
+
+    summarizer.fail = False
+    chat(conversation, ["q5"])
+    assert summarizer.calls[-1] == ["q1", "q2", "q3"]
+    assert [turn.question for turn in conversation.turns] == ["q4", "q5"]
+
+
+def test_summary_is_capped_to_the_token_budget(store):
+    conversation = history(store, lambda summary, turns, max_tokens: "word " * 200, budget=20)
+    chat(conversation, ["q1", "q2", "q3", "q4"])
+
+    assert estimate_tokens(conversation.summary) <= 20 + 1
+    assert history(store, StubSummarizer()).summary == conversation.summary
+
+
+def test_clear_forgets_the_session(store):
+    conversation = history(store, StubSummarizer())
+    chat(conversation, ["q1", "q2", "q3", "q4"])
+    conversation.clear()
+
+    assert conversation.render() is None
+    assert not store.exists("s")
+
+
+@pytest.mark.asyncio
+async def test_async_record_and_compact(store):
+    summarizer = StubSummarizer()
+    conversation = history(store, summarizer, max_recent_turns=1)
+    await conversation.arecord("q1", "a1")
+    await conversation.arecord("q2", "a2")
+    await conversation.acompact()
+
+    assert summarizer.calls == [["q1"]]
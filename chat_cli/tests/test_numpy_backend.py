@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+from qdrant_client import QdrantClient
+from qdrant_client.http.models import Distance, PointStruct, VectorParams
+
+from core.settings import Config
+from evaluation.recall import normalize
+from vectordb import numpy_backend, qdrant_factory
+from vectordb.numpy_backend import NumpyIndex, NumpyQdrant, has_cached_export, load_index
+from vectordb.qdrant_factory import PatchedQdrant, select_backend
+
+PAYLOADS = [
+    {"domain": "hr", "filename": "vacation.md"},
+    {"domain": "hr", "filename": "benefits.md"},
+    {"domain": "product", "filename": "install.md"},
+]
+
+
+def index():
+    vectors = normalize(np.array([[1, 0, 0], [0.8, 0.6, 0], [0, 0, 1]], dtype=np.float32))
+    return NumpyIndex(collection="docs", ids=["a", "b", "c"], vectors=vectors, payloads=PAYLOADS)
+
+
+def test_top_k_returns_best_rows_first_with_cosine_scores():
+    hits = index().top_k(np.array([2.0, 0.0, 0.0], dtype=np.float32), limit=2)
+
+    assert [row for row, _ in hits] == [0, 1]
+    assert [round(score, 3) for _, score in hits] == [1.0, 0.8]
+
+
+def test_top_k_is_limited_to_rows_allowed_by_the_mask():
+    docs = index()
+    mask = docs.mask({"domain": ["product"]})
+
+    assert mask.tolist() == [False, False, True]
+    assert docs.top_k(np.array([1.0, 0.0, 0.0], dtype=np.float32), limit=3, mask=mask) == [(2, 0.0)]
+    assert docs.top_k(np.array([1.0, 0.0, 0.0], dtype=np.float32), limit=3, mask=np.zeros(3, dtype=bool)) == []
+
+
+def test_mask_requires_every_condition():
+    mask = index().mask({"domain": ["hr", "product"], "filename": ["benefits.md", "install.md"]})
+    assert mask.tolist() == [False, True, True]
+
+
+def test_zero_query_vector_does_not_fail():
+    assert len(index().top_k(np.zeros(3, dtype=np.float32), limit=3)) == 3
+
+
+class UnreachableClient:
+    def scroll(self, **kwargs):
+        raise ConnectionError("Qdrant is down")
+
+    def count(self, **kwargs):
+        raise ConnectionError("Qdrant is down")
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "NUMPY_BACKEND_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(numpy_backend, "_indexes", {})
+    return str(tmp_path / "cache")
+
+
+def seed_cache():
+    client = QdrantClient(location=":memory:")
+    client.create_collection("docs", vectors_config=VectorParams(size=3, distance=Distance.COSINE))
+    client.upsert("docs", [PointStruct(id=1, vector=[1.0, 0.0, 0.0], payload=PAYLOADS[0])])
+    load_index(client, "docs")
+    client.close()
+
+
+def test_cached_export_is_served_when_qdrant_is_unreachable(cache_dir, monkeypatch):
+    with pytest.raises(ConnectionError):
+        load_index(UnreachableClient(), "docs")
+
+    seed_cache()
+    monkeypatch.setattr(numpy_backend, "_indexes", {})
+
+    docs = load_index(UnreachableClient(), "docs")
+    assert has_cached_export("docs")
+    assert docs.ids == ["1"] and docs.payloads == [PAYLOADS[0]]
+
+
+def test_auto_backend_uses_the_cached_export_when_qdrant_is_unreachable(cache_dir, monkeypatch):
+    monkeypatch.setattr(Config, "VECTOR_BACKEND", "auto")
+    monkeypatch.setattr(qdrant_factory, "get_qdrant_client", UnreachableClient)
+
+    assert select_backend("docs") is PatchedQdrant
+    seed_cache()
+    assert select_backend("docs") is NumpyQdrant
+
+
+def test_auto_backend_picks_by_collection_size(monkeypatch):
+    client = QdrantClient(location=":memory:")
+    client.create_collection("docs", vectors_config=VectorParams(size=3, distance=Distance.COSINE))
+    client.upsert("docs", [PointStruct(id=i, vector=[1.0, 0.0, float(i)]) for i in range(3)])
+    monkeypatch.setattr(Config, "VECTOR_BACKEND", "auto")
+    monkeypatch.setattr(qdrant_factory, "get_qdrant_client", lambda: client)
+
+    monkeypatch.setattr(Config, "NUMPY_BACKEND_MAX_POINTS", 3)
+    assert select_backend("docs") is NumpyQdrant
+    monkeypatch.setattr(Config, "NUMPY_BACKEND_MAX_POINTS", 2)
+    assert select_backend("docs") is PatchedQdrant
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+from qdrant_client import QdrantClient
+from qdrant_client.http.models import Distance, PointStruct, VectorParams
+
+from evaluation.recall import (
+    ConfigResult, SearchConfig, ann_bypass_reason, build_sweep, evaluate, exact_top_k, export_collection,
+    fastest_meeting_target, normalize,
+)
+
+VECTORS = normalize(np.array([[1, 0, 0], [0.9, 0.1, 0], [0, 1, 0], [0, 0, 1]], dtype=np.float32))
+
+
+def test_exact_top_k_orders_by_cosine_similarity():
+    query = np.array([[2.0, 0.1, 0.0]], dtype=np.float32)
+    assert exact_top_k(VECTORS, query, 3).tolist() == [[0, 1, 2]]
+
+
+def test_exact_top_k_never_returns_the_excluded_row():
+    rows = exact_top_k(VECTORS, VECTORS, 10, exclude=[0, 1, 2, 3])
+
+    assert rows.shape == (4, 3)
+    assert all(row not in neighbours for row, neighbours in enumerate(rows.tolist()))
+    assert rows[0, 0] == 1 and rows[1, 0] == 0
+
+
+def test_exact_top_k_with_a_single_point_and_exclusion_is_empty():
+    assert exact_top_k(VECTORS[:1], VECTORS[:1], 4, exclude=[0]).shape == (1, 0)
+
+
+def test_normalize_leaves_zero_rows_alone():
+    normalized = normalize(np.array([[3.0, 4.0], [0.0, 0.0]]))
+    assert normalized.tolist() == [[0.6, 0.8], [0.0, 0.0]]
+
+
+def test_fastest_meeting_target_picks_lowest_p50_with_enough_recall():
+    results = [
+        ConfigResult(SearchConfig(limit=4, exact=True), recall=1.0, latencies=[0.004]),
+        ConfigResult(SearchConfig(limit=4, hnsw_ef=16), recall=0.9, latencies=[0.001]),
+        ConfigResult(SearchConfig(limit=4, hnsw_ef=32), recall=0.97, latencies=[0.002]),
+        ConfigResult(SearchConfig(limit=8, hnsw_ef=16), recall=1.0, latencies=[0.0005]),
+    ]
+
+    assert fastest_meeting_target(results, 0.95, limit=4).config.hnsw_ef == 32
+    assert fastest_meeting_target(results, 1.1, limit=4) is None
+
+
+def test_build_sweep_labels():
+    labels = [config.label for config in build_sweep([4], [0, 32], quantization=True)]
+    assert labels == ["exact", "ef=default", "ef=default, no rescore", "ef=32", "ef=32, no rescore"]
+
+
+@pytest.fixture
+def client():
+    client = QdrantClient(location=":memory:")
+    client.create_collection("docs", vectors_config=VectorParams(size=3, distance=Distance.COSINE))
+    vectors = np.random.default_rng(0).normal(size=(20, 3))
+    client.upsert("docs", [
+        PointStruct(id=i, vector=vector.tolist(), payload={"domain": "hr" if i < 5 else "product"})
+        for i, vector in enumerate(vectors)
+    ])
+    yield client
+    client.close()
+
+
+def test_self_queries_reach_full_recall_against_exact_search(client):
+    export = export_collection(client, "docs")
+    rows = np.arange(len(export))
+
+    # A limit of n asks for more neighbours than exist once the query's own point is excluded
+    sweep = build_sweep([4, len(export)], [0])
+    results = evaluate(client, export, export.vectors[rows], sweep, exclude=rows, warmup=0)
+
+    assert [result.recall for result in results] == [1.0] * 4
+
+
+def test_export_filters_by_domain(client):
+    export = export_collection(client, "docs", domain="hr")
+    assert sorted(export.ids, key=int) == ["0", "1", "2", "3", "4"]
+
+
+def test_small_collection_is_reported_as_full_scan(client):
+    reason = ann_bypass_reason(client, export_collection(client, "docs"))
+    assert reason is not None and "full scan" in reason
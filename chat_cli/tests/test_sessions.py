@@ -0,0 +1,143 @@
+import asyncio
+
+import pytest
+
+from api.server import _stream_turn
+from api.sessions import ChatSession, QueueFullError, RunLimiter
+from history.manager import ConversationHistory
+
+
+class FakeTeam:
+    """Team stand-in whose streamed run waits until the test releases it"""
+
+    def __init__(self):
+        self.members = []
+        self.run_response = None
+        self.memory = None
+        self.session_id = None
+        self.release = asyncio.Event()
+
+    async def arun(self, message, stream=False, session_id=None):
+        await self.release.wait()
+
+        async def chunks():
+            yield type("Chunk", (), {"content": "ok"})()
+
+        return chunks()
+
+
+class FakeHistory:
+    def __init__(self, session_id):
+        self.session_id = session_id
+        self.recorded = []
+
+    def render(self):
+        return None
+
+    async def arecord(self, question, answer):
+        self.recorded.append((question, answer))
+
+    async def acompact(self):
+        pass
+
+
+async def hold(limiter, release):
+    async with limiter.slot():
+        await release.wait()
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_runs_beyond_the_limit_wait_for_a_slot():
+    limiter = RunLimiter(max_concurrent=2, max_queued=4)
+    release = asyncio.Event()
+    tasks = [asyncio.create_task(hold(limiter, release)) for _ in range(3)]
+    await settle()
+
+    assert (limiter.running, limiter.waiting) == (2, 1)
+    release.set()
+    await asyncio.gather(*tasks)
+    assert (limiter.running, limiter.waiting) == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_full_queue_is_rejected():
+    limiter = RunLimiter(max_concurrent=1, max_queued=1)
+    release = asyncio.Event()
+    tasks = [asyncio.create_task(hold(limiter, release)) for _ in range(2)]
+    await settle()
+
+    assert limiter.is_saturated()
+    with pytest.raises(QueueFullError):
+        async with limiter.slot():
+            pass
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert not limiter.is_saturated()
+
+
+@pytest.mark.asyncio
+async def test_slot_is_released_when_the_run_fails():
+    limiter = RunLimiter(max_concurrent=1, max_queued=0)
+    with pytest.raises(RuntimeError):
+        async with limiter.slot():
+            raise RuntimeError("model error")
+
+    async with limiter.slot():
+        assert limiter.running == 1
+    assert limiter.running == 0
+
+
+@pytest.mark.asyncio
+async def test_queued_turn_of_a_busy_session_does_not_hold_a_slot():
+    limiter = RunLimiter(max_concurrent=2, max_queued=4)
+    team = FakeTeam()
+    session = ChatSession(session_id="s", team=team, history=FakeHistory("s"))
+
+    first = asyncio.create_task(_collect(_stream_turn(session, limiter, "first")))
+    second = asyncio.create_task(_collect(_stream_turn(session, limiter, "second")))
+    await settle()
+
+    # The second turn waits on the session lock, not in the run queue
+    assert (limiter.running, limiter.waiting) == (1, 0)
+
+    team.release.set()
+    await asyncio.gather(first, second)
+    assert session.history.recorded == [("first", "ok"), ("second", "ok")]
+    assert limiter.running == 0
+
+
+@pytest.mark.asyncio
+async def test_history_is_compacted_after_done_outside_the_run_slot(store):
+    limiter = RunLimiter(max_concurrent=1, max_queued=0)
+    team = FakeTeam()
+    team.release.set()
+    running_during_compaction = []
+
+    def summarizer(summary, turns, max_tokens):
+        running_during_compaction.append(limiter.running)
+        return "summary"
+
+    history = ConversationHistory("s", store=store, max_recent_turns=1, summarizer=summarizer)
+    session = ChatSession(session_id="s", team=team, history=history)
+
+    events = _stream_turn(session, limiter, "first")
+    assert [event async for event in events][-1].startswith("event: done")
+    assert running_during_compaction == []
+
+    events = _stream_turn(session, limiter, "second")
+    async for event in events:
+        if event.startswith("event: done"):
+            # The answer is out before the summarizer is called
+            assert running_during_compaction == []
+    assert running_during_compaction == [0]
+    assert history.summary == "summary"
+
+
+async def _collect(events):
+    return [event async for event in events]
@@ -0,0 +1,70 @@
+import io
+from types import SimpleNamespace
+
+import pytest
+from rich.console import Console
+
+from core.usage import TokenUsage
+from main import show_member_responses
+from ui.stream_renderer import StreamRenderer, _block_boundary, format_latency_footer
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("no blank line yet", -1),
+        ("first\n\nsecond", 7),
+        ("a\n\nb\n\nc", 6),
+        ("intro\n\n```python\nx = 1\n\ny = 2", 7),
+        ("```\ncode\n\nmore\n```\n\nafter", 20),
+        ("```\nonly inside\n\nthe fence", -1),
+    ],
+)
+def test_block_boundary_skips_blank_lines_inside_code_fences(text, expected):
+    assert _block_boundary(text) == expected
+
+
+def console():
+    return Console(file=io.StringIO(), width=80, color_system=None)
+
+
+def test_completed_blocks_are_printed_once():
+    out = console()
+    with StreamRenderer(out, fps=1000, show_footer=False) as renderer:
+        for delta in ["Para", "graph one.\n", "\nParagraph ", "two.\n\n", "Tail"]:
+            renderer.feed(delta)
+
+    printed = out.file.getvalue()
+    assert renderer.text == "Paragraph one.\n\nParagraph two.\n\nTail"
+    assert [printed.count(block) for block in ("Paragraph one.", "Paragraph two.", "Tail")] == [1, 1, 1]
+    assert printed.index("Paragraph one.") < printed.index("Paragraph two.") < printed.index("Tail")
+    assert renderer.ttft is not None and renderer.total >= renderer.ttft
+
+
+def test_footer_reports_latency_and_cache_usage():
+    out = console()
+    with StreamRenderer(out, show_footer=True) as renderer:
+        renderer.feed("Answer")
+        renderer.usage = TokenUsage(prompt_tokens=100, cached_tokens=50)
+
+    assert "first token" in out.file.getvalue()
+    assert "50 cached, 50%" in out.file.getvalue()
+    assert "n/a" in format_latency_footer(None, 1.0)
+
+
+def test_member_responses_are_shown_once_as_they_complete():
+    out = console()
+    hr = SimpleNamespace(agent_id="hr", name="HR Policies Specialist")
+    run_response = SimpleNamespace(member_responses=[])
+    team = SimpleNamespace(members=[hr], run_response=run_response)
+
+    with StreamRenderer(out, show_footer=False) as renderer:
+        shown = show_member_responses(renderer, team, 0)
+        run_response.member_responses.append(SimpleNamespace(agent_id="hr", content="Ten days of vacation."))
+        shown = show_member_responses(renderer, team, shown)
+        shown = show_member_responses(renderer, team, shown)
+
+    printed = out.file.getvalue()
+    assert shown == 1
+    assert printed.count("HR Policies Specialist Response") == 1
+    assert "Ten days of vacation." in printed
@@ -0,0 +1,32 @@
+from types import SimpleNamespace
+
+from agno.memory.v2.memory import Memory
+from agno.run.response import RunResponse
+
+from history.manager import ConversationHistory
+from teams.rh_team_specialist import build_rh_team_message
+
+
+def test_member_interactions_are_reset_every_turn(store):
+    memory = Memory()
+    team = SimpleNamespace(members=[SimpleNamespace(context=None)], memory=memory, session_id=None)
+    history = ConversationHistory("s", store=store, max_recent_turns=2)
+
+    build_rh_team_message(team, history, "First question")
+    memory.add_interaction_to_team_context("s", "HR Policies Specialist", "task", RunResponse(content="answer"))
+    memory.add_interaction_to_team_context("other", "HR Policies Specialist", "task", RunResponse(content="answer"))
+
+    message = build_rh_team_message(team, history, "Second question")
+
+    assert memory.team_context["s"].member_interactions == []
+    assert len(memory.team_context["other"].member_interactions) == 1
+    assert message.endswith("</context>\n\nSecond question")
+    assert "current_datetime" in team.members[0].context
+
+
+def test_team_without_memory_yet_is_accepted(store):
+    team = SimpleNamespace(members=[], memory=None, session_id=None)
+    history = ConversationHistory("s", store=store)
+
+    assert build_rh_team_message(team, history, "Question").endswith("Question")
+    assert team.session_id == "s"